@@ -47,126 +47,670 @@ Variáveis de ambiente necessárias:
 
 import sys
 import json
+import logging
+import logging.handlers
 import sqlite3
 import time
+import queue
 import threading
 
 import os
+import math
+from pathlib import Path
+from string import Template
+from functools import lru_cache
+from dataclasses import dataclass
+import numpy as np
 from dotenv import load_dotenv
 
+# orjson (C) é opcional: (de)codifica JSON mais rápido que o módulo json
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+
+
+def loads_json(payload):
+    """Decode a JSON payload with orjson when available, falling back to json."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # orjson rejeita alguns payloads que o json aceita (ex: NaN, surrogates)
+            pass
+    return json.loads(payload)
+
+
+def dumps_json(obj):
+    """Encode ``obj`` as a JSON ``str`` with orjson when available, falling back to json."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+# Logs do caminho quente (MQTT, comandos) usam logging com formatação preguiçosa;
+# o handler é configurado uma única vez no ``__main__`` (nível via LOG_LEVEL)
+logger = logging.getLogger("dashboard")
+
 # Load environment variables from workspace root (.env located at project root)
 WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 load_dotenv(os.path.join(WORKSPACE_ROOT, ".env"))
 
 import paho.mqtt.client as mqtt
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, Qt, QPoint as _QPoint, QSize as _QSize, QRect as _QRect, QRectF as _QRectF, QMargins, QTimer
+from PyQt5.QtCore import QObject, QFile, QIODevice, QStandardPaths, QUrl, pyqtSignal, pyqtSlot, Qt, QPoint, QSize, QRect, QPointF, QMargins, QTimer
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QListWidget, QListWidgetItem, QWidget, QVBoxLayout, QLabel, 
     QHBoxLayout, QPushButton, QFrame, QGridLayout, QScrollArea, QSplitter
 )
 from PyQt5.QtChart import QChart, QChartView, QLineSeries, QValueAxis
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineProfile
 from PyQt5.QtWebChannel import QWebChannel
-from PyQt5.QtGui import QPainter as _QPainter, QFont as _QFont, QPen as _QPen, QIcon, QColor, QBrush
-
-# Monkey-patch QPoint to handle float arguments (fix for AnalogGaugeWidget compatibility)
-class QPoint(_QPoint):
-    def __new__(cls, *args):
-        if len(args) == 2:
-            # Convert float arguments to int
-            return _QPoint(int(args[0]), int(args[1]))
-        return _QPoint(*args)
-
-# Monkey-patch QSize to handle float arguments (fix for AnalogGaugeWidget compatibility)
-class QSize(_QSize):
-    def __new__(cls, *args):
-        if len(args) == 2:
-            # Convert float arguments to int
-            return _QSize(int(args[0]), int(args[1]))
-        return _QSize(*args)
-
-# Monkey-patch QRect to handle float arguments
-class QRect(_QRect):
-    def __init__(self, *args):
-        if len(args) == 4:
-            # QRect(x, y, width, height) - convert floats to ints
-            super().__init__(int(args[0]), int(args[1]), int(args[2]), int(args[3]))
-        elif len(args) == 2:
-            # QRect(QPoint, QSize)
-            super().__init__(args[0], args[1])
-        else:
-            super().__init__(*args)
-
-# Monkey-patch QRectF to ensure compatibility
-class QRectF(_QRectF):
-    pass
-
-# Monkey-patch QFont to handle float arguments
-class QFont(_QFont):
-    def __init__(self, *args, **kwargs):
-        if len(args) >= 2 and isinstance(args[1], float):
-            # QFont(family, pointSize, ...) - convert float pointSize to int
-            args = list(args)
-            args[1] = int(args[1])
-        super().__init__(*args, **kwargs)
-
-# Monkey-patch QPen to handle float arguments
-class QPen(_QPen):
-    def setWidth(self, width):
-        """Override setWidth to handle float values"""
-        return super().setWidth(int(width) if isinstance(width, float) else width)
-
-# Monkey-patch QPainter methods to handle float arguments
-class QPainter(_QPainter):
-    def drawLine(self, *args):
-        """Override drawLine to handle float coordinates"""
-        if len(args) == 4:
-            # drawLine(x1, y1, x2, y2) - convert floats to ints
-            return super().drawLine(int(args[0]), int(args[1]), int(args[2]), int(args[3]))
-        return super().drawLine(*args)
-    
-    def drawEllipse(self, *args):
-        """Override drawEllipse to handle float coordinates"""
-        if len(args) == 4:
-            # drawEllipse(x, y, width, height) - convert floats to ints
-            return super().drawEllipse(int(args[0]), int(args[1]), int(args[2]), int(args[3]))
-        return super().drawEllipse(*args)
-    
-    def drawArc(self, *args):
-        """Override drawArc to handle float coordinates"""
-        if len(args) == 6:
-            # drawArc(x, y, width, height, startAngle, spanAngle) - convert floats to ints
-            return super().drawArc(int(args[0]), int(args[1]), int(args[2]), int(args[3]), int(args[4]), int(args[5]))
-        return super().drawArc(*args)
-    
-    def drawPolygon(self, *args):
-        """Override drawPolygon to handle various argument types"""
-        return super().drawPolygon(*args)
-    
-    def drawText(self, *args):
-        """Override drawText to handle float coordinates"""
-        if len(args) >= 3 and isinstance(args[0], (int, float)) and isinstance(args[1], (int, float)):
-            # drawText(x, y, text, ...) - convert floats to ints
-            new_args = [int(args[0]), int(args[1])] + list(args[2:])
-            return super().drawText(*new_args)
-        return super().drawText(*args)
-
-# Replace all patched classes in PyQt5 modules before importing AnalogGaugeWidget
-import PyQt5.QtCore
-import PyQt5.QtGui
-PyQt5.QtCore.QPoint = QPoint
-PyQt5.QtCore.QSize = QSize
-PyQt5.QtCore.QRect = QRect
-PyQt5.QtCore.QRectF = QRectF
-PyQt5.QtGui.QPainter = QPainter
-PyQt5.QtGui.QFont = QFont
-PyQt5.QtGui.QPen = QPen
+from PyQt5.QtGui import QPainter, QFont, QFontMetrics, QPen, QPolygon, QConicalGradient, QIcon, QColor, QBrush
 
 from Custom_Widgets.AnalogGaugeWidget import AnalogGaugeWidget
 from services.rackControlService import Rack, RackControlService, DoorStatus, VentilationStatus, BuzzerStatus
 from services.toolCallingService import ToolCallingService
 from services.forecastService import ForecastService
 
+
+class IntGaugeWidget(AnalogGaugeWidget):
+    """
+    AnalogGaugeWidget com coordenadas inteiras nas chamadas ao Qt.
+
+    O widget original passa floats onde o PyQt5 exige int (QPoint, QSize,
+    QFont, drawLine, drawText). Em vez de envolver as classes do Qt em
+    wrappers Python, os métodos de desenho que fazem essas chamadas são
+    sobrescritos com ``int(...)`` no ponto de chamada; o restante do widget
+    e a aplicação usam as classes nativas.
+    """
+
+    def rescale_method(self):
+        self.widget_diameter = min(self.width(), self.height())
+        needleTip = int(-self.widget_diameter / 2 * self.needle_scale_factor)
+        self.change_value_needle_style([QPolygon([
+            QPoint(4, 30),
+            QPoint(-4, 30),
+            QPoint(-2, needleTip),
+            QPoint(0, needleTip - 6),
+            QPoint(2, needleTip)
+        ])])
+        # Tamanhos de fonte inteiros: QFont(family, pointSize) não aceita float
+        self.scale_fontsize = int(self.initial_scale_fontsize * self.widget_diameter / 400)
+        self.value_fontsize = int(self.initial_value_fontsize * self.widget_diameter / 400)
+
+    def draw_filled_polygon(self, outline_pen_with=0):
+        if self.scale_polygon_colors is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.setPen(Qt.NoPen)
+        self.pen.setWidth(int(outline_pen_with))
+        if outline_pen_with > 0:
+            painter.setPen(self.pen)
+        radius = (self.widget_diameter / 2) - (self.pen.width() / 2)
+        polygon = self.create_polygon_pie(
+            radius * self.gauge_color_outer_radius_factor,
+            radius * self.gauge_color_inner_radius_factor,
+            self.scale_angle_start_value, self.scale_angle_size)
+        grad = QConicalGradient(QPointF(0, 0), - self.scale_angle_size - self.scale_angle_start_value +
+                                self.angle_offset - 1)
+        for eachcolor in self.scale_polygon_colors:
+            grad.setColorAt(eachcolor[0], eachcolor[1])
+        painter.setBrush(grad)
+        painter.drawPolygon(polygon)
+
+    def _draw_scale_lines(self, pen, count, lengthDivisor):
+        """Desenha ``count + 1`` marcas radiais da escala (grossas ou finas)."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.setPen(pen)
+        painter.rotate(self.scale_angle_start_value - self.angle_offset)
+        stepSize = float(self.scale_angle_size) / float(count)
+        outerStart = int(self.widget_diameter / 2)
+        innerStart = int((self.widget_diameter / 2) - (self.widget_diameter / lengthDivisor))
+        for _ in range(count + 1):
+            painter.drawLine(innerStart, 0, outerStart, 0)
+            painter.rotate(stepSize)
+
+    def draw_big_scaled_marker(self):
+        self.pen = QPen(self.bigScaleMarker)
+        self.pen.setWidth(2)
+        self._draw_scale_lines(self.pen, self.scalaCount, 20)
+
+    def create_fine_scaled_marker(self):
+        self._draw_scale_lines(self.fineScaleColor, self.scalaCount * self.scala_subdiv_count, 40)
+
+    def _draw_value_text(self, text, fontSize, angle):
+        """Desenha ``text`` com a fonte de valor, centralizado no raio de texto, no ângulo dado (graus)."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        font = QFont(self.value_fontname, fontSize, QFont.Bold)
+        fm = QFontMetrics(font)
+        pen = QPen()
+        pen.setBrush(self.DisplayValueColor)
+        painter.setPen(pen)
+        painter.setFont(font)
+        self._draw_text_at(painter, fm, text, self.widget_diameter / 2 * self.text_radius_factor, angle)
+
+    def _draw_text_at(self, painter, fm, text, radius, angle):
+        w = fm.width(text) + 1
+        h = fm.height()
+        x = radius * math.cos(math.radians(angle))
+        y = radius * math.sin(math.radians(angle))
+        painter.drawText(int(x - w / 2), int(y - h / 2), int(w), int(h), Qt.AlignCenter, text)
+
+    def create_scale_marker_values_text(self):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        font = QFont(self.scale_fontname, int(self.scale_fontsize), QFont.Bold)
+        fm = QFontMetrics(font)
+        pen = QPen()
+        pen.setBrush(self.ScaleValueColor)
+        painter.setPen(pen)
+        painter.setFont(font)
+        textRadius = self.widget_diameter / 2 * 0.8
+        scalePerDiv = int((self.maxValue - self.minValue) / self.scalaCount)
+        angleDistance = float(self.scale_angle_size) / float(self.scalaCount)
+        for i in range(self.scalaCount + 1):
+            text = str(int(self.minValue + scalePerDiv * i))
+            angle = angleDistance * i + float(self.scale_angle_start_value - self.angle_offset)
+            self._draw_text_at(painter, fm, text, textRadius, angle)
+
+    def create_values_text(self):
+        angleEnd = float(self.scale_angle_start_value + self.scale_angle_size - 360)
+        angle = (angleEnd - self.scale_angle_start_value) / 2 + self.scale_angle_start_value
+        self._draw_value_text(str(int(self.value)), int(self.value_fontsize), angle)
+
+    def create_units_text(self):
+        angleEnd = float(self.scale_angle_start_value + self.scale_angle_size + 180)
+        angle = (angleEnd - self.scale_angle_start_value) / 2 + self.scale_angle_start_value
+        self._draw_value_text(str(self.units), int(self.value_fontsize / 2.5), angle)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Configuração do dashboard lida do ambiente (``.env``) uma única vez."""
+    mqtt_server: str | None
+    mqtt_username: str | None
+    mqtt_password: str | None
+    mqtt_port: int = 1883
+    mqtt_keepalive: int = 60
+    temp_low: float = 28.0
+    temp_high: float = 35.0
+
+    @classmethod
+    def load(cls) -> "Config":
+        """Cria a configuração a partir de ``os.environ``."""
+        env = os.environ
+        return cls(
+            mqtt_server=env.get("MQTT_SERVER"),
+            mqtt_username=env.get("MQTT_USERNAME"),
+            mqtt_password=env.get("MQTT_PASSWORD"),
+            mqtt_port=int(env.get("MQTT_PORT", 1883)),
+            mqtt_keepalive=int(env.get("MQTT_KEEPALIVE", 60)),
+            temp_low=float(env.get("TEMP_LOW_THRESHOLD", "28")),
+            temp_high=float(env.get("TEMP_HIGH_THRESHOLD", "35")),
+        )
+
+# Previsão vazia compartilhada (somente leitura) para racks sem histórico
+EMPTY_FORECAST = np.empty(0, dtype=np.float32)
+EMPTY_FORECAST.setflags(write=False)
+
+# Estado inicial de um rack em MainWindow.rack_states (valores imutáveis: uma
+# cópia rasa do dict basta para cada rack)
+RACK_STATE_DEFAULTS = {
+    'temperature': None,
+    'humidity': None,
+    'door_status': None,
+    'ventilation_status': None,
+    'buzzer_status': None,
+    # GPS data (padronizado com firmware)
+    'latitude': None,
+    'longitude': None,
+    'altitude': None,
+    'gps_time': None,
+    'gps_speed': None,
+    # Tilt sensor (padronizado com firmware)
+    'tilt': False,
+    # Historical data (ring buffers NumPy alocados na primeira amostra)
+    'temperature_history': None,
+    'temperature_history_head': 0,
+    'temperature_history_len': 0,
+    'humidity_history': None,
+    'humidity_history_head': 0,
+    'humidity_history_len': 0,
+    'temperature_forecast': EMPTY_FORECAST,
+    'humidity_forecast': EMPTY_FORECAST,
+    'last_sample_timestamp': None,
+    # Incrementado a cada mudança de temperatura, umidade, porta, ventilação ou
+    # buzzer: syncRackFromState pula racks já sincronizados nessa revisão
+    'revision': 0
+}
+
+# Estado da porta (0 = fechada, 1 = aberta) para logs
+DOOR_STATE_NAMES = ('FECHADA', 'ABERTA')
+
+# Estados do buzzer (0-3): nome para logs e (texto, cor) do rótulo no painel
+BUZZER_STATE_NAMES = {0: 'Desligado', 1: 'Porta Aberta', 2: 'Arrombamento', 3: 'Superaquecimento'}
+BUZZER_STATE_LABELS = {
+    0: ('🔕 Buzzer: Desligado', '#95a5a6'),
+    1: ('🔔 Buzzer: Porta Aberta', '#f39c12'),
+    2: ('🚨 Buzzer: ARROMBAMENTO', '#e74c3c'),
+    3: ('🔥 Buzzer: SUPERAQUECIMENTO', '#e74c3c')
+}
+BUZZER_UNKNOWN_LABEL = ('🔔 Buzzer: --', '#95a5a6')
+
+# Ações da IA: texto legível na barra de status e quais piscam o rack em vermelho
+ACTION_NAMES = {
+    'turnOnVentilation': '💨 Ligar Ventilação',
+    'turnOffVentilation': '💨 Desligar Ventilação',
+    'activateCriticalTemperatureAlert': '🔥 Alerta Temperatura Crítica',
+    'deactivateCriticalTemperatureAlert': '✅ Desativar Alerta Temp.',
+    'activateDoorOpenAlert': '🚪 Alerta Porta Aberta',
+    'activateBreakInAlert': '🚨 Alerta Arrombamento',
+    'silenceBuzzer': '🔕 Silenciar Buzzer',
+    'openDoor': '🚪 Abrir Porta',
+    'closeDoor': '🚪 Fechar Porta'
+}
+ALERT_ACTIONS = frozenset({
+    'activateCriticalTemperatureAlert',
+    'activateDoorOpenAlert',
+    'activateBreakInAlert'
+})
+
+# Folhas de estilo montadas uma única vez: setStyleSheet recebe sempre o mesmo
+# objeto str, sem formatar nem gerar CSS novo a cada atualização
+_STATUS_LABEL_QSS = """
+    QLabel {{
+        color: white;
+        font-size: 16px;
+        padding: 10px 20px;
+        background-color: {color};
+        border-radius: 5px;
+    }}
+"""
+_BUZZER_LABEL_QSS = """
+    QLabel {{
+        color: white;
+        font-size: 16px;
+        font-weight: bold;
+        padding: 15px;
+        background-color: {color};
+        border-radius: 5px;
+    }}
+"""
+
+# Porta: (texto, estilo) do rótulo do cabeçalho por estado
+DOOR_STYLES = {
+    0: ('🔒 Porta: FECHADA', _STATUS_LABEL_QSS.format(color='#c0392b')),
+    1: ('🚪 Porta: ABERTA', _STATUS_LABEL_QSS.format(color='#27ae60')),
+}
+DOOR_UNKNOWN_STYLE = ('🚪 Status: --', _STATUS_LABEL_QSS.format(color='#7f8c8d'))
+
+# Buzzer: (texto, estilo) do rótulo no painel por estado
+BUZZER_STYLES = {
+    status: (text, _BUZZER_LABEL_QSS.format(color=color))
+    for status, (text, color) in BUZZER_STATE_LABELS.items()
+}
+BUZZER_UNKNOWN_STYLE = (BUZZER_UNKNOWN_LABEL[0], _BUZZER_LABEL_QSS.format(color=BUZZER_UNKNOWN_LABEL[1]))
+
+# Barra de status: ícone e mensagem com ação em andamento / em espera
+STATUS_ICON_ACTIVE_QSS = """
+    QLabel {
+        color: #27ae60;
+        font-size: 16px;
+    }
+"""
+STATUS_ICON_IDLE_QSS = """
+    QLabel {
+        color: #95a5a6;
+        font-size: 16px;
+    }
+"""
+STATUS_MESSAGE_ACTIVE_QSS = """
+    QLabel {
+        color: #27ae60;
+        font-size: 13px;
+        font-weight: bold;
+    }
+"""
+STATUS_MESSAGE_IDLE_QSS = """
+    QLabel {
+        color: #ecf0f1;
+        font-size: 13px;
+    }
+"""
+
+# Cores da piscagem de itens da lista de racks
+BLINK_NORMAL_BG = QColor("#34495e")
+BLINK_NORMAL_FG = QColor("white")
+BLINK_HIGHLIGHT_FG = QColor("#2c3e50")
+BLINK_ALERT_BG = QColor("#e74c3c")
+BLINK_ACTION_BG = QColor("#f39c12")
+
+# Origem (base URL) da página do mapa; precisa ser estável para o cache HTTP do Leaflet
+MAP_BASE_URL = "https://dashboard.local/"
+
+# Página do mapa (Leaflet + OpenStreetMap), compilada uma única vez.
+# A página não carrega dados: o FeatureCollection GeoJSON inicial vem de
+# mapReady() e o JS cria cada marcador via upsertRack.
+MAP_HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Mapa dos Racks</title>
+    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" 
+          integrity="sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY=" 
+          crossorigin=""/>
+    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js" 
+            integrity="sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo=" 
+            crossorigin=""></script>
+    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.css" crossorigin=""/>
+    <link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.Default.css" crossorigin=""/>
+    <script src="https://unpkg.com/leaflet.markercluster@1.5.3/dist/leaflet.markercluster.js" crossorigin=""></script>
+    $qwebchannel_script
+    <style>
+        html, body {
+            margin: 0;
+            padding: 0;
+            height: 100%;
+            width: 100%;
+        }
+        #map {
+            height: 100%;
+            width: 100%;
+            border-radius: 10px;
+        }
+        .leaflet-control-attribution {
+            font-size: 10px;
+        }
+    </style>
+</head>
+<body>
+    <div id="map"></div>
+    <script>
+        // Inicializa o mapa centrado em Fortaleza-CE, Brasil
+        // preferCanvas: os racks não selecionados são desenhados num único canvas
+        var map = L.map('map', {preferCanvas: true}).setView([-3.7319, -38.5267], 12);
+        var markers = {};
+        var selectedId = null;
+        var useCluster = false;
+        var rackLayer = null;
+        // Durante a carga inicial os marcadores são acumulados para um único addLayers
+        var pending = null;
+        
+        // Tiles do OpenStreetMap (ODbL License)
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            maxZoom: 19,
+            attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
+        }).addTo(map);
+        
+        // Configura comunicação com Python via WebChannel
+        new QWebChannel(qt.webChannelTransport, function(channel) {
+            window.pybridge = channel.objects.pybridge;
+            // Atualizações de marcadores chegam como sinal, sem recarregar a página
+            window.pybridge.racksUpdated.connect(function(batchJson) {
+                applyBatch(JSON.parse(batchJson));
+            });
+            window.pybridge.mapReady(function(stateJson) {
+                loadRacks(JSON.parse(stateJson));
+            });
+        });
+        
+        function escapeHtml(text) {
+            var div = document.createElement('div');
+            div.textContent = text;
+            return div.innerHTML;
+        }
+        
+        function addRackLayer(marker) {
+            if (pending) {
+                pending.push(marker);
+            } else {
+                rackLayer.addLayer(marker);
+            }
+        }
+        
+        function removeRackLayer(marker) {
+            if (pending) {
+                pending.splice(pending.indexOf(marker), 1);
+            } else {
+                rackLayer.removeLayer(marker);
+            }
+        }
+        
+        // Abre o popup; dentro de um cluster, expande-o antes
+        function revealMarker(marker) {
+            if (useCluster) {
+                rackLayer.zoomToShowLayer(marker, function() {
+                    marker.openPopup();
+                });
+            } else {
+                marker.openPopup();
+            }
+        }
+        
+        // Ícone com rótulo "🖥️ id": usado apenas no rack selecionado (nó DOM)
+        function rackIcon(rackId) {
+            return L.divIcon({
+                className: 'rack-marker',
+                html: '<div style="background-color: #2c3e50; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold; font-size: 11px; box-shadow: 0 2px 5px rgba(0,0,0,0.3); border: 3px solid #f39c12; cursor: pointer;">🖥️ ' + escapeHtml(rackId) + '</div>',
+                iconSize: [80, 25],
+                iconAnchor: [40, 25],
+                popupAnchor: [0, -25]
+            });
+        }
+        
+        // Tabelas de decoração do popup, montadas uma vez por página
+        var TEMP_ICONS = ['❄️ Temp: ', '🌡️ Temp: ', '🔥 Temp: '];       // < 18, 18-35, > 35 °C
+        var HUM_ICONS = ['🏜️ Umidade: ', '💨 Umidade: ', '💧 Umidade: '];  // < 30, 30-70, > 70 %
+        var DOOR_LINES = ['🔒 Porta: FECHADA', '🚪 Porta: ABERTA'];
+        var VENT_LINES = ['🛑 Ventilação: DESLIGADA', '💨 Ventilação: LIGADA'];
+        var BUZZER_LINES = ['', '🔔 Porta Aberta', '🚨 ARROMBAMENTO', '🔥 SUPERAQUECIMENTO'];
+        
+        // Faixa (0 abaixo, 1 dentro, 2 acima) de um valor em [low, high]
+        function band(value, low, high) {
+            return (value >= low) + (value > high);
+        }
+        
+        // Monta o popup a partir das propriedades da Feature (só quando aberto)
+        function renderPopup(p, latlng) {
+            var lines = ['<b>🖥️ Rack ' + escapeHtml(p.id) + '</b>'];
+            if (p.t != null) {
+                lines.push(TEMP_ICONS[band(p.t, 18, 35)] + p.t.toFixed(1) + '°C');
+            }
+            if (p.h != null) {
+                lines.push(HUM_ICONS[band(p.h, 30, 70)] + p.h.toFixed(1) + '%');
+            }
+            if (p.d != null) {
+                lines.push(DOOR_LINES[p.d === 1 ? 1 : 0]);
+            }
+            if (p.v != null) {
+                lines.push(VENT_LINES[p.v === 1 ? 1 : 0]);
+            }
+            if (p.b > 0) {
+                lines.push(BUZZER_LINES[p.b] || '');
+            }
+            lines.push('<small>📍 ' + latlng.lat.toFixed(6) + ', ' + latlng.lng.toFixed(6) + '</small>');
+            return lines.join('<br>');
+        }
+        
+        // Demais racks: circleMarker desenhado no canvas, com o id no tooltip
+        function createMarker(feature, latlng, selected) {
+            var rackId = feature.properties.id;
+            var marker;
+            if (selected) {
+                marker = L.marker(latlng, {icon: rackIcon(rackId)});
+            } else {
+                marker = L.circleMarker(latlng, {
+                    radius: 8,
+                    color: '#3498db',
+                    fillColor: '#3498db',
+                    fillOpacity: 0.9
+                }).bindTooltip(escapeHtml(rackId));
+            }
+            marker.on('click', function() {
+                if (window.pybridge) {
+                    window.pybridge.selectRackFromMap(rackId);
+                }
+            });
+            marker.feature = feature;
+            marker.bindPopup(function(layer) {
+                return renderPopup(layer.feature.properties, layer.getLatLng());
+            });
+            return marker;
+        }
+        
+        // pointToLayer no estilo de L.geoJSON: destaca o rack selecionado
+        function pointToLayer(feature, latlng) {
+            return createMarker(feature, latlng, feature.properties.id === selectedId);
+        }
+        
+        // Troca o tipo de marcador (canvas <-> divIcon) preservando posição e dados
+        function replaceMarker(rackId, selected) {
+            var old = markers[rackId];
+            var marker = createMarker(old.feature, old.getLatLng(), selected);
+            removeRackLayer(old);
+            addRackLayer(marker);
+            markers[rackId] = marker;
+        }
+        
+        // Cria o marcador ou move/atualiza o existente (chamada pelo Python)
+        window.upsertRack = function(feature) {
+            var rackId = feature.properties.id;
+            var latlng = L.GeoJSON.coordsToLatLng(feature.geometry.coordinates);
+            var marker = markers[rackId];
+            if (marker) {
+                marker.feature = feature;
+                marker.setLatLng(latlng);
+                if (marker.isPopupOpen()) {
+                    marker.getPopup().update();
+                }
+            } else {
+                marker = pointToLayer(feature, latlng);
+                addRackLayer(marker);
+                markers[rackId] = marker;
+            }
+        };
+        
+        window.removeRack = function(rackId) {
+            if (markers[rackId]) {
+                removeRackLayer(markers[rackId]);
+                delete markers[rackId];
+            }
+            if (selectedId === rackId) {
+                selectedId = null;
+            }
+        };
+        
+        // Troca o destaque do rack selecionado
+        window.setSelected = function(rackId) {
+            if (rackId === selectedId) {
+                return;
+            }
+            if (selectedId && markers[selectedId]) {
+                replaceMarker(selectedId, false);
+            }
+            selectedId = rackId;
+            if (rackId && markers[rackId]) {
+                replaceMarker(rackId, true);
+            }
+        };
+        
+        // Função para centralizar no rack (chamada pelo Python)
+        window.centerOnRack = function(rackId) {
+            if (markers[rackId]) {
+                map.setView(markers[rackId].getLatLng(), 14);
+                revealMarker(markers[rackId]);
+            }
+        };
+        
+        // Lote de diffs vindo do Python: Features (geometry nula = remoção) e seleção
+        window.applyBatch = function(batch) {
+            batch.features.forEach(function(feature) {
+                if (feature.geometry) {
+                    upsertRack(feature);
+                } else {
+                    removeRack(feature.properties.id);
+                }
+            });
+            if ('selected' in batch) {
+                setSelected(batch.selected);
+                centerOnRack(batch.selected);
+            }
+        };
+        
+        // Carga inicial: FeatureCollection GeoJSON com propriedades compactas
+        function loadRacks(state) {
+            if (rackLayer) {
+                map.removeLayer(rackLayer);
+            }
+            markers = {};
+            selectedId = state.selected;
+            // Acima do limiar os racks vão para um MarkerCluster com chunkedLoading,
+            // que insere em lotes e devolve a thread da página entre eles
+            useCluster = state.data.features.length > $cluster_threshold && typeof L.markerClusterGroup === 'function';
+            rackLayer = useCluster ? L.markerClusterGroup({
+                chunkedLoading: true,
+                chunkInterval: 200,
+                chunkDelay: 50,
+                removeOutsideVisibleBounds: true
+            }) : L.layerGroup();
+            pending = [];
+            state.data.features.forEach(function(feature) {
+                upsertRack(feature);
+            });
+            map.setView(state.center, state.zoom);
+            map.addLayer(rackLayer);
+            if (useCluster) {
+                rackLayer.addLayers(pending);
+            } else {
+                pending.forEach(function(m) {
+                    rackLayer.addLayer(m);
+                });
+            }
+            pending = null;
+            if (selectedId && markers[selectedId]) {
+                revealMarker(markers[selectedId]);
+            }
+        }
+    </script>
+</body>
+</html>
+""")
+
+
+class MapBridge(QObject):
+    """
+    Objeto exposto ao JavaScript do mapa como ``pybridge`` (QWebChannel).
+    
+    Só publica o que a página usa, em vez de todos os slots e propriedades da
+    ``MainWindow``; as chamadas são repassadas à janela.
+    """
+    
+    racksUpdated = pyqtSignal(str)  # JSON {features: [...], selected?} - batched diff for the map JS
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self._window = window
+    
+    @pyqtSlot(str)
+    def selectRackFromMap(self, rack_id: str):
+        """Rack clicado no mapa."""
+        self._window.selectRackFromMap(rack_id)
+    
+    @pyqtSlot(result=str)
+    def mapReady(self):
+        """Página conectada ao canal: devolve o estado inicial em JSON."""
+        return self._window.mapReady()
+
+
 class MainWindow(QMainWindow):
     """
     Janela principal do Dashboard de Racks Inteligentes.
@@ -176,8 +720,8 @@ class MainWindow(QMainWindow):
     controles de atuadores.
     
     Attributes:
-        message_received (pyqtSignal): Sinal emitido quando mensagem MQTT é recebida.
-            Parâmetros: dict com 'topic', 'rack_id' e 'payload'.
+        message_received (pyqtSignal): Sinal emitido com o lote de mensagens MQTT recebidas.
+            Parâmetros: list de dicts com 'topic', 'rack_id' e 'payload'.
         action_executed (pyqtSignal): Sinal emitido quando ação AI é executada.
             Parâmetros: rackId (str), action (str).
         status_updated (pyqtSignal): Sinal para atualizar barra de status.
@@ -191,7 +735,7 @@ class MainWindow(QMainWindow):
         forecastService (ForecastService): Serviço de previsão de séries temporais.
     
     Signals:
-        message_received: Emitido na thread MQTT, processado na thread UI.
+        message_received: Emitido pelo timer de drenagem na thread UI (lote a cada ~50 ms).
         action_executed: Emitido quando IA executa ação em um rack.
         status_updated: Emitido para atualizar informações na barra de status.
     
@@ -202,7 +746,7 @@ class MainWindow(QMainWindow):
         >>> app.exec_()
     """
     
-    message_received = pyqtSignal(dict)
+    message_received = pyqtSignal(list)
     action_executed = pyqtSignal(str, str)  # rackId, action - signal for AI actions
     status_updated = pyqtSignal(str, str, str)  # rackId, action, reason - signal for status bar
 
@@ -210,6 +754,9 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setWindowTitle("Dashboard Rack Inteligente - EmbarcaTech")
         
+        # Configuração do ambiente, lida uma vez
+        self.config = Config.load()
+        
         # Fullscreen mode
         self.showMaximized()
         
@@ -235,48 +782,161 @@ class MainWindow(QMainWindow):
         self.base_topic = os.getenv("MQTT_BASE_TOPIC", "racks").rstrip("/")
 
         # Historical data configuration
-        # Armazena dados para 7 dias de histórico (coleta a cada segundo)
-        self.history_limit = int(os.getenv("FORECAST_CONTEXT_LENGTH", "168")) * 3600  # 168h * 3600s = 7 dias
+        # Amostras brutas (1 Hz) ficam apenas na janela recente exibida no gráfico;
+        # o contexto da previsão (7 dias) é mantido como médias horárias agregadas na ingestão
+        self.history_limit = int(os.getenv("CHART_HISTORY_SECONDS", "3600"))
+        self.forecast_context_hours = int(os.getenv("FORECAST_CONTEXT_LENGTH", "168"))  # 168h = 7 dias
         self.history_interval_seconds = 1
         # Horizonte de previsão: 24 horas
         self.forecast_horizon = int(os.getenv("FORECAST_HORIZON", "24"))
+        # Intervalo mínimo entre reajustes do modelo; entre eles a última previsão é reutilizada
+        self.forecast_refit_interval = max(1, int(os.getenv("FORECAST_REFIT_INTERVAL", "300")))
+        # O modelo trabalha com médias horárias: por padrão, no máximo uma previsão por hora
+        self.forecast_min_interval = max(1, int(os.getenv("FORECAST_MIN_INTERVAL", "3600")))
+        # Repaint coalescing: producers mark racks dirty, a single-shot timer redraws (≤30 Hz)
+        self.ui_flush_interval_ms = 33
+        self._ui_dirty = set()
+        self._ui_flush_pending = False
+        # Último valor desenhado por widget do rack exibido (pula setText/setStyleSheet repetidos)
+        self._last_rendered = {}
+        # Erros repetidos no caminho MQTT: (origem, tipo) -> (último log, suprimidos)
+        self._error_log_state = {}
+        # Último estado desenhado por série do gráfico (amostras, previsão e eixos)
+        self._chart_cache = {}
+        # Mapa: racks com marcador a reenviar e flag de mudança na lista de racks
+        self._map_dirty = set()
+        self._structure_dirty = False
+        # Soma das coordenadas dos racks localizados (centro do mapa em O(1))
+        self._centroid_sum_lat = 0.0
+        self._centroid_sum_lon = 0.0
+        self._centroid_n = 0
+        self.chart_use_opengl = os.getenv("CHART_USE_OPENGL", "true").lower() in ("1", "true", "yes")
+        # Acima deste número de racks o mapa agrupa marcadores (Leaflet.markercluster)
+        self.map_cluster_threshold = int(os.getenv("MAP_CLUSTER_THRESHOLD", "200"))
         self.temp_series = None
         self.temp_axis_x = None
         self.temp_axis_y = None
         self.temp_forecast_series = None
+        self.temp_chart_view = None
         self.hum_series = None
         self.hum_axis_x = None
         self.hum_axis_y = None
         self.hum_forecast_series = None
+        self.hum_chart_view = None
 
         # Setup UI
         self.setup_ui()
 
         # Connect signal to update UI from MQTT messages in the GUI thread
-        self.message_received.connect(self.handle_message_update)
-
-        # Banco SQLite
-        self.conn = sqlite3.connect("data.db", check_same_thread=False)
-        self.db_lock = threading.Lock()
-        self.execute_db(
-            """
-            CREATE TABLE IF NOT EXISTS rack_data (
-                id TEXT,
-                latitude REAL,
-                longitude REAL,
-                temperature REAL,
-                humidity REAL,
-                door_status INTEGER,
-                ventilation_status INTEGER,
-                buzzer_status INTEGER,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        self.message_received.connect(self.handle_message_batch)
+
+        # Sufixo do tópico (após '<base>/<rack_id>/') -> handler, resolvido uma vez por mensagem
+        self._topic_handlers = {
+            'environment/door': self._on_environment_door,
+            'environment/temperature': self._on_temperature,
+            'environment/humidity': self._on_humidity,
+            'command/door': self._on_command_door,
+            'command/ventilation': self._on_command_ventilation,
+            'command/buzzer': self._on_command_buzzer,
+            'gps': self._on_gps,
+            'tilt': self._on_tilt,
+            'ack/door': self._on_ack_door,
+            'ack/ventilation': self._on_ack_ventilation,
+            'ack/buzzer': self._on_ack_buzzer,
+        }
+
+        # MQTT thread appends to a batch; a 20 Hz timer hands it to the GUI thread at once
+        self._rx_batch: list[dict] = []
+        self._rx_lock = threading.Lock()
+        self.rx_drain_timer = QTimer(self)
+        self.rx_drain_timer.setInterval(50)
+        self.rx_drain_timer.timeout.connect(self.drain_rx_batch)
+        self.rx_drain_timer.start()
+
+        # Atualizações do mapa são agrupadas: rajadas de mensagens viram um único refresh
+        self._map_refresh_timer = QTimer(self)
+        self._map_refresh_timer.setSingleShot(True)
+        self._map_refresh_timer.setInterval(150)
+        self._map_refresh_timer.timeout.connect(self._flush_map_updates)
+
+        # Rajadas de mensagens do mesmo rack viram uma única gravação no banco e
+        # uma única atualização de telemetria para a IA a cada PERSIST_DEBOUNCE_MS
+        self._dirty_racks = set()
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.setInterval(int(os.getenv("PERSIST_DEBOUNCE_MS", "100")))
+        self._persist_timer.timeout.connect(self._flush_dirty_racks)
+
+        # Banco SQLite (WAL: leitores não bloqueiam o escritor; commits em lote)
+        # Cada thread usa sua própria conexão; a conexão de bootstrap só cria o schema
+        self.db_path = "data.db"
+        self._local = threading.local()
+        bootstrap = self.configure_db_connection(sqlite3.connect(self.db_path))
+        try:
+            bootstrap.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rack_data (
+                    id TEXT,
+                    latitude REAL,
+                    longitude REAL,
+                    temperature REAL,
+                    humidity REAL,
+                    door_status INTEGER,
+                    ventilation_status INTEGER,
+                    buzzer_status INTEGER,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            # Índice para a leitura do último registro de um rack (WHERE id=? ORDER BY timestamp)
+            bootstrap.execute(
+                "CREATE INDEX IF NOT EXISTS idx_rack_data_id_ts ON rack_data(id, timestamp)"
+            )
+            # Catálogo de racks: evita varrer rack_data com SELECT DISTINCT na inicialização
+            hasRacksTable = bootstrap.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='racks'"
+            ).fetchone()
+            bootstrap.execute(
+                "CREATE TABLE IF NOT EXISTS racks (id TEXT PRIMARY KEY, latitude REAL, longitude REAL)"
             )
-            """
-        , commit=True)
+            racksColumns = {column[1] for column in bootstrap.execute("PRAGMA table_info(racks)")}
+            for column in ('latitude', 'longitude'):
+                if column not in racksColumns:
+                    bootstrap.execute(f"ALTER TABLE racks ADD COLUMN {column} REAL")
+            if not hasRacksTable:
+                # Migração única de bancos existentes
+                bootstrap.execute("INSERT OR IGNORE INTO racks(id) SELECT DISTINCT id FROM rack_data")
+            # Telemetria compactada: uma linha por rack e minuto com as amostras em um BLOB
+            bootstrap.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rack_minute (
+                    id TEXT,
+                    ts INTEGER,
+                    payload BLOB,
+                    PRIMARY KEY (id, ts)
+                )
+                """
+            )
+            bootstrap.commit()
+        finally:
+            bootstrap.close()
+        # Itens da lista lateral por rack_id: existência e busca em O(1), sem findItems()
+        self._rack_list_items: dict[str, QListWidgetItem] = {}
+        # Racks cujo último estado gravado já foi carregado do banco para rack_states
+        self._db_restored_racks = set()
+        # Revisão de rack_states já copiada para cada objeto Rack (syncRackFromState)
+        self._rackSyncedRevision: dict[str, int] = {}
         # Carrega racks existentes do DB
-        racks = self.execute_db("SELECT DISTINCT id FROM rack_data", fetchall=True)
+        racks = self.execute_db("SELECT id FROM racks ORDER BY rowid", fetchall=True)
         for (rid,) in racks:
-            self.list_widget.addItem(f"Rack {str(rid)}")
+            self._add_rack_list_item(str(rid))
+
+        # Telemetria é gravada por uma thread dedicada em lotes (executemany + 1 commit)
+        self.db_batch_size = int(os.getenv("DB_BATCH_SIZE", "500"))
+        self.db_batch_interval = int(os.getenv("DB_BATCH_INTERVAL_MS", "100")) / 1000.0
+        self._write_q = queue.SimpleQueue()
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer_thread.start()
 
         # MQTT
         self.setup_mqtt()
@@ -298,9 +958,12 @@ class MainWindow(QMainWindow):
             self.list_widget.setCurrentRow(0)
 
         # Timer para amostragem periódica de histórico
+        # Timer mestre: um único despertar por segundo despacha amostragem,
+        # expiração de comandos e análise AI (contador de ticks)
+        self._tick = 0
         self.history_timer = QTimer(self)
         self.history_timer.setInterval(self.history_interval_seconds * 1000)
-        self.history_timer.timeout.connect(self.sample_current_state)
+        self.history_timer.timeout.connect(self.on_master_tick)
         self.history_timer.start()
 
         # Initialize Forecast Service for time series prediction
@@ -309,22 +972,19 @@ class MainWindow(QMainWindow):
         # Initialize Tool Calling Service for AI-driven control
         self.initializeToolCallingService()
 
-        # Timer para análise AI periódica (intervalo do .env)
-        aiInterval = int(os.getenv("AI_ANALYSIS_INTERVAL", "10")) * 1000
-        self.aiAnalysisTimer = QTimer(self)
-        self.aiAnalysisTimer.setInterval(aiInterval)
-        self.aiAnalysisTimer.timeout.connect(self.runAiAnalysis)
-        self.aiAnalysisTimer.start()
-
-        # Timer para verificar comandos pendentes expirados
-        # Verifica a cada 1 segundo se há comandos que não receberam ACK
-        self.commandTimeoutTimer = QTimer(self)
-        self.commandTimeoutTimer.setInterval(1000)  # 1 segundo
-        self.commandTimeoutTimer.timeout.connect(self.checkExpiredCommands)
-        self.commandTimeoutTimer.start()
+        # Análise AI periódica (intervalo do .env), em ticks do timer mestre
+        aiInterval = int(os.getenv("AI_ANALYSIS_INTERVAL", "10"))
+        self.aiAnalysisTicks = max(1, aiInterval // self.history_interval_seconds)
+        # Telemetria repassada à IA: último (valores, instante) por rack
+        self.ai_telemetry_refresh_seconds = self.aiAnalysisTicks * self.history_interval_seconds
+        self._last_ai_state = {}
 
-        # Dicionário para controle de piscagem de racks
-        self.blinkingRacks: dict[str, QTimer] = {}
+        # Piscagem de racks: um único timer compartilhado percorre o dicionário
+        # rackId -> [item, corDestaque, contagem, maxPiscadas]
+        self.blinkingRacks: dict[str, list] = {}
+        self._blinkTimer = QTimer(self)
+        self._blinkTimer.setInterval(200)
+        self._blinkTimer.timeout.connect(self._tickBlinks)
 
     def setup_ui(self):
         """Setup the user interface with modern UX design"""
@@ -500,16 +1160,8 @@ class MainWindow(QMainWindow):
         layout.addStretch()
         
         # Door status indicator
-        self.door_status_label = QLabel("🚪 Status: --")
-        self.door_status_label.setStyleSheet("""
-            QLabel {
-                color: white;
-                font-size: 16px;
-                padding: 10px 20px;
-                background-color: #7f8c8d;
-                border-radius: 5px;
-            }
-        """)
+        self.door_status_label = QLabel(DOOR_UNKNOWN_STYLE[0])
+        self.door_status_label.setStyleSheet(DOOR_UNKNOWN_STYLE[1])
         layout.addWidget(self.door_status_label)
         
         return header
@@ -584,7 +1236,7 @@ class MainWindow(QMainWindow):
         gauge_column = QVBoxLayout()
         gauge_column.setAlignment(Qt.AlignCenter)
         
-        gauge = AnalogGaugeWidget()
+        gauge = IntGaugeWidget()
         gauge.units = unit
         gauge.minValue = 0
         gauge.maxValue = 100
@@ -623,6 +1275,9 @@ class MainWindow(QMainWindow):
         
         series = QLineSeries()
         series.setColor(QColor(series_color))
+        # Histórico é a série longa: desenhada via OpenGL em vez do raster por software.
+        # A previsão (24 pontos, tracejada) fica no raster, que preserva o estilo da caneta.
+        series.setUseOpenGL(self.chart_use_opengl)
         chart.addSeries(series)
 
         forecast_series = QLineSeries()
@@ -662,50 +1317,174 @@ class MainWindow(QMainWindow):
         # Store references based on metric
         if metric == "temperature":
             self.temp_gauge = gauge
+            # Limites fixos do gauge, lidos uma vez para o clamp em update_ui_from_state
+            self._temp_gauge_min, self._temp_gauge_max = gauge.minValue, gauge.maxValue
             self.temp_value_label = value_label
             self.temp_series = series
             self.temp_forecast_series = forecast_series
+            self.temp_chart_view = chart_view
             self.temp_axis_x = axis_x
             self.temp_axis_y = axis_y
         elif metric == "humidity":
             self.hum_gauge = gauge
+            self._hum_gauge_min, self._hum_gauge_max = gauge.minValue, gauge.maxValue
             self.hum_value_label = value_label
             self.hum_series = series
             self.hum_forecast_series = forecast_series
+            self.hum_chart_view = chart_view
             self.hum_axis_x = axis_x
             self.hum_axis_y = axis_y
         
         return frame
 
     def append_history_sample(self, state, history_key, value, timestamp):
-        """Append telemetry sample to history respecting limit"""
+        """
+        Append telemetry sample to the rack's circular history buffer.
+
+        O histórico é um ``np.ndarray`` float32 pré-alocado com ``history_limit``
+        posições, acompanhado dos índices ``{history_key}_head`` (próxima escrita)
+        e ``{history_key}_len`` (amostras válidas). A inserção é um único store
+        indexado e o descarte da amostra mais antiga é apenas o avanço do head.
+        A amostra também alimenta o acumulador horário usado pela previsão.
+        """
         if value is None or timestamp is None:
             return
-        history = state.setdefault(history_key, [])
-        history.append(value)
-        if len(history) > self.history_limit:
-            history.pop(0)
+        self._ring_append(state, history_key, value, self.history_limit)
+        self._accumulate_hourly(state, history_key, value, timestamp)
+
+    def _ring_append(self, state, ring_key, value, capacity, dtype=np.float32):
+        """Store ``value`` in the ring ``state[ring_key]``, allocating it on first use."""
+        head_key = f"{ring_key}_head"
+        len_key = f"{ring_key}_len"
+        ring = state.get(ring_key)
+        if not isinstance(ring, np.ndarray):
+            # Alocação preguiçosa: racks sem telemetria não reservam memória
+            ring = np.empty(capacity, dtype=dtype)
+            state[ring_key] = ring
+            state[head_key] = 0
+            state[len_key] = 0
+        capacity = ring.shape[0]
+        head = state[head_key]
+        ring[head] = value
+        state[head_key] = (head + 1) % capacity
+        state[len_key] = min(state[len_key] + 1, capacity)
+
+    def _accumulate_hourly(self, state, history_key, value, timestamp):
+        """
+        Add a sample to the running mean of the current UTC epoch hour.
+
+        Os baldes usam a hora UTC (``int(t // 3600)``), que não recua na troca
+        de horário de verão. Na virada da hora a média da hora encerrada é
+        gravada no anel ``{history_key}_hourly`` (``forecast_context_hours``
+        posições) e o índice da hora no anel paralelo ``{history_key}_hourly_idx``.
+        Horas puladas (host suspenso, timer parado) são preenchidas com a média
+        da última hora encerrada, mantendo a série horária contígua. Amostras
+        com hora anterior à corrente (relógio ajustado para trás) entram no
+        balde corrente.
+        """
+        hour = int(timestamp // 3600)
+        index_key = f"{history_key}_hour_index"
+        sum_key = f"{history_key}_hour_sum"
+        count_key = f"{history_key}_hour_count"
+        current = state.get(index_key)
+        if current is None or hour > current:
+            if current is not None and state.get(count_key):
+                mean = state[sum_key] / state[count_key]
+                # A hora encerrada e as horas puladas até a nova (limitadas ao anel)
+                firstHour = max(current, hour - self.forecast_context_hours)
+                for closedHour in range(firstHour, hour):
+                    self._ring_append(state, f"{history_key}_hourly", mean, self.forecast_context_hours)
+                    self._ring_append(
+                        state, f"{history_key}_hourly_idx", closedHour, self.forecast_context_hours, np.int64
+                    )
+            state[index_key] = hour
+            state[sum_key] = 0.0
+            state[count_key] = 0
+        state[sum_key] += value
+        state[count_key] += 1
+
+    def hourly_view(self, state, history_key):
+        """
+        Return ``(values, startTimestamp)`` with the hourly means in chronological order.
+
+        Inclui a média parcial da hora corrente como último ponto, como fazia a
+        reamostragem horária do histórico bruto. As horas fechadas são contíguas
+        (``_accumulate_hourly`` preenche as lacunas) e ``startTimestamp`` vem do
+        índice UTC gravado para a hora mais antiga do anel.
+        """
+        closed = self.ordered_view(state, f"{history_key}_hourly")
+        count = state.get(f"{history_key}_hour_count", 0)
+        if count:
+            values = np.append(closed, np.float32(state[f"{history_key}_hour_sum"] / count))
+        else:
+            values = closed
+        hour = state.get(f"{history_key}_hour_index")
+        if hour is None:
+            return values, None
+        closedHours = self.ordered_view(state, f"{history_key}_hourly_idx")
+        firstHour = int(closedHours[0]) if closedHours.size else hour
+        return values, float(firstHour * 3600)
+
+    def ordered_view(self, state, history_key):
+        """
+        Return the history buffer in chronological order (oldest first).
+
+        Enquanto o buffer não deu a volta, retorna uma view sem cópia; após
+        completar a capacidade, concatena as duas metades uma única vez.
+        """
+        history = state.get(history_key)
+        length = state.get(f"{history_key}_len", 0)
+        if not isinstance(history, np.ndarray) or length == 0:
+            return np.empty(0, dtype=np.float32)
+        if length < history.shape[0]:
+            return history[:length]
+        head = state[f"{history_key}_head"]
+        return np.concatenate((history[head:], history[:head]))
+
+    def history_last(self, state, history_key, back=1):
+        """Return the ``back``-th most recent history sample, or None if unavailable."""
+        history = state.get(history_key)
+        length = state.get(f"{history_key}_len", 0)
+        if not isinstance(history, np.ndarray) or length < back:
+            return None
+        head = state[f"{history_key}_head"]
+        return float(history[(head - back) % history.shape[0]])
 
     def append_history_with_previous(self, state, metric, timestamp):
         """Append current metric value to history or reuse last known sample for chart continuity"""
         history_key = f"{metric}_history"
         value = state.get(metric)
         if value is None:
-            history = state.get(history_key) or []
-            if history:
-                value = history[-1]
+            value = self.history_last(state, history_key)
         if value is None:
             return False
         self.append_history_sample(state, history_key, value, timestamp)
         self.update_metric_forecast(state, metric)
         return True
 
+    def on_master_tick(self):
+        """
+        Dispatch all periodic work from the single master timer.
+
+        A cada tick: amostragem do histórico e verificação de comandos sem ACK;
+        a cada ``aiAnalysisTicks`` ticks: análise AI.
+        """
+        self._tick += 1
+        self.sample_current_state()
+        try:
+            self.checkExpiredCommands()
+        except Exception as e:
+            logger.error("[UI/Error] ❌ Error checking expired commands: %s", e)
+        if self._tick % self.aiAnalysisTicks == 0:
+            self.runAiAnalysis()
+
     def sample_current_state(self):
         """Periodically sample telemetry to drive history charts"""
         try:
             now = time.time()
-            for rack_id, state in list(self.rack_states.items()):
-                state = self.ensure_rack_state(rack_id)
+            # rack_states só é alterado na thread da GUI (mensagens MQTT chegam via sinal),
+            # e nada neste laço insere racks: iterar sem copiar é seguro
+            for rack_id, state in self.rack_states.items():
                 last_ts = state.get('last_sample_timestamp')
                 if last_ts is not None and (now - last_ts) < self.history_interval_seconds:
                     continue
@@ -715,10 +1494,9 @@ class MainWindow(QMainWindow):
 
                 if temp_sampled or hum_sampled:
                     state['last_sample_timestamp'] = now
-                    if self.current_rack_id == rack_id:
-                        self.update_ui_from_state(rack_id)
+                    self.mark_ui_dirty(rack_id)
         except Exception as e:
-            print(f"[UI/Error] ❌ Error sampling history: {e}")
+            logger.error("[UI/Error] ❌ Error sampling history: %s", e)
 
     def update_metric_forecast(self, state, metric):
         """
@@ -728,10 +1506,14 @@ class MainWindow(QMainWindow):
         - Granite TTM as primary model
         - SARIMA as fallback with daily seasonality (24h)
         - Annual seasonality for climate prediction
-        - Data aggregation: raw samples -> hourly averages
+        - Hourly averages accumulated at ingest time
         - Humidity as exogenous variable for temperature prediction
         
-        Predicts 24 hours ahead using 7 days of historical data.
+        Predicts 24 hours ahead using 7 days of historical data. The model is
+        refit at most once per ``FORECAST_REFIT_INTERVAL`` seconds; in between
+        the cached forecast is reused. Once a model forecast exists, the whole
+        computation is skipped until the next ``FORECAST_MIN_INTERVAL`` slot
+        (one hour by default).
         
         Args:
             state: Rack state dictionary
@@ -739,57 +1521,65 @@ class MainWindow(QMainWindow):
         """
         history_key = f"{metric}_history"
         forecast_key = f"{metric}_forecast"
-        history = state.get(history_key) or []
 
-        if not history:
-            state[forecast_key] = []
+        # Skip entirely while the model forecast for the current slot is still valid
+        forecastSlot = int(time.time() // self.forecast_min_interval)
+        forecast = state.get(forecast_key)
+        if state.get(f'{metric}_forecast_hour') == forecastSlot and forecast is not None and len(forecast):
+            return
+
+        history = self.ordered_view(state, history_key)
+
+        if history.size == 0:
+            state[forecast_key] = EMPTY_FORECAST
             return
 
-        # Minimum data requirement: at least 1 hour of samples (3600 points at 1s interval)
-        minSamples = 3600  # 1 hour
+        # Minimum data requirement: the service needs 10 points, which are now hourly means
+        minHourlyPoints = 10
+        hourly, startTimestamp = self.hourly_view(state, history_key)
         
         # Try using ForecastService (Granite TTM / SARIMA fallback)
-        if self.forecastService is not None and len(history) >= minSamples:
+        if self.forecastService is not None and len(hourly) >= minHourlyPoints:
+            # Reuse the cached forecast until the next refit epoch
+            epoch = int(time.time() // self.forecast_refit_interval)
+            epochKey = f'_{metric}_fcast_epoch'
+            cachedKey = f'_{metric}_fcast_cached'
+            if state.get(epochKey) == epoch and state.get(cachedKey) is not None:
+                state[forecast_key] = state[cachedKey]
+                return
             try:
-                # Prepare data history for ForecastService
-                # Use all available history (up to 7 days) for better seasonal analysis
-                dataHistory = []
-                currentTime = time.time()
-                historySlice = history[-self.history_limit:]  # Up to 7 days
-                
-                for i, value in enumerate(historySlice):
-                    timestamp = currentTime - (len(historySlice) - i - 1)
-                    dataHistory.append({
-                        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp)),
-                        'value': value
-                    })
+                # O histórico já chega agregado em médias horárias (até 7 dias),
+                # acumuladas na ingestão: o preparo da previsão é O(168).
                 
                 # Prepare exogenous data (humidity) for temperature prediction
-                exogenousData = None
+                exogenousValues = None
                 if metric == 'temperature':
-                    humidityHistory = state.get('humidity_history') or []
-                    if len(humidityHistory) >= minSamples:
-                        exogenousData = []
-                        humiditySlice = humidityHistory[-self.history_limit:]
-                        for i, value in enumerate(humiditySlice):
-                            timestamp = currentTime - (len(humiditySlice) - i - 1)
-                            exogenousData.append({
-                                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(timestamp)),
-                                'value': value
-                            })
+                    humidityHourly, _ = self.hourly_view(state, 'humidity_history')
+                    if len(humidityHourly) >= minHourlyPoints:
+                        exogenousValues = humidityHourly
                 
-                # Get prediction from ForecastService (will aggregate to hourly internally)
-                result = self.forecastService.predict(
-                    dataHistory, 
-                    aggregateData=True,
-                    exogenousData=exogenousData
+                # Get prediction from ForecastService (hourly data, no re-aggregation).
+                # startTimestamp é o início da hora UTC mais antiga do anel; o serviço
+                # rotula os pontos em UTC, como os baldes de aggregateHourlyArray.
+                result = self.forecastService.predictArray(
+                    hourly,
+                    startTimestamp,
+                    periodSeconds=3600,
+                    exogenousValues=exogenousValues,
+                    aggregateData=False
                 )
                 
                 if result and 'predictions' in result:
                     predictions = result['predictions']
-                    # Extract 24 hourly predictions
-                    forecast = [p['value'] for p in predictions[:self.forecast_horizon]]
+                    # Extract 24 hourly predictions (float32, None vira NaN)
+                    forecast = np.array(
+                        [p['value'] for p in predictions[:self.forecast_horizon]],
+                        dtype=np.float32
+                    )
                     state[forecast_key] = forecast
+                    state[epochKey] = epoch
+                    state[cachedKey] = forecast
+                    state[f'{metric}_forecast_hour'] = forecastSlot
                     
                     # Store metadata for debugging
                     state[f'{metric}_forecast_model'] = result.get('model', 'unknown')
@@ -799,68 +1589,136 @@ class MainWindow(QMainWindow):
                     
                     # Update MAE tracking if we have actual values to compare
                     if len(history) >= 2:
-                        lastPredicted = history[-1]
-                        lastActual = history[-2]
+                        lastPredicted = float(history[-1])
+                        lastActual = float(history[-2])
                         self.forecastService.updateMaeTracking(lastPredicted, lastActual)
                     
                     return
                     
             except Exception as e:
-                print(f"[Forecast/Error] ⚠️ ForecastService error for {metric}: {e}")
+                logger.warning("[Forecast/Error] ⚠️ ForecastService error for %s: %s", metric, e)
         
         # Fallback to simple linear forecast (for display before enough data collected)
-        last_value = history[-1]
+        last_value = float(history[-1])
         if len(history) >= 2:
-            slope = history[-1] - history[-2]
+            slope = last_value - float(history[-2])
         else:
             slope = 0.0
 
-        forecast = []
-        for step in range(1, self.forecast_horizon + 1):
-            forecast.append(last_value + slope * step)
+        forecast = last_value + slope * np.arange(1, self.forecast_horizon + 1, dtype=np.float32)
 
         state[forecast_key] = forecast
 
-    def update_chart(self, series, forecast_series, axis_x, axis_y, history, forecast, default_min=0, default_max=100):
-        """Update line chart with new historical data"""
+    def _decimate(self, values, target):
+        """
+        Reduce ``values`` to at most ``target`` points by averaging fixed-size buckets.
+
+        Returns:
+            tuple: (x, y) arrays, with x at the center of each bucket expressed
+            in original sample indices so the time axis keeps its scale.
+        """
+        length = values.shape[0]
+        if target <= 0 or length <= target:
+            return np.arange(length, dtype=np.float64), values
+        bucket = -(-length // target)  # ceil
+        starts = np.arange(0, length, bucket)
+        counts = np.diff(np.append(starts, length))
+        means = np.add.reduceat(values, starts, dtype=np.float64) / counts
+        return starts + (counts - 1) / 2.0, means
+
+    def update_chart(self, series, forecast_series, axis_x, axis_y, history, forecast, default_min=0, default_max=100, chart_view=None):
+        """
+        Update line chart with new historical data (``history`` is a chronological ndarray).
+
+        O histórico é decimado para a largura em pixels do ``chart_view``: não há
+        ganho visual em desenhar mais pontos do que colunas disponíveis. Enquanto
+        o histórico ainda cresce sem decimação, apenas as amostras novas são
+        anexadas à série; a previsão só é redesenhada quando o array muda e os
+        eixos só recebem setRange() quando a faixa muda.
+        """
         if series is None or axis_x is None or axis_y is None:
             return
 
-        # Filter out None values
-        values = [v for v in history if v is not None]
+        values = np.asarray(history, dtype=np.float32)
+        cache = self._chart_cache.setdefault(series, {})
 
-        series.clear()
-        if forecast_series is not None:
-            forecast_series.clear()
-
-        if values:
+        if values.size:
             # Keep only the most recent samples within limit
             values = values[-self.history_limit:]
-            for idx, value in enumerate(values):
-                series.append(idx, value)
-
-            forecast_values = forecast or []
-            forecast_values = [v for v in forecast_values if v is not None]
-            for offset, value in enumerate(forecast_values, start=len(values)):
+            length = len(values)
+            target = (chart_view.width() if chart_view is not None else 0) or 800
+            drawn = cache.get('samples')
+            if (
+                drawn is not None
+                and drawn < length < self.history_limit
+                and length <= target
+                and series.count() == drawn
+                and cache.get('last') == float(values[drawn - 1])
+            ):
+                # Histórico só cresceu: anexa os pontos novos sem refazer a série
+                for x, y in enumerate(values[drawn:].tolist(), start=drawn):
+                    series.append(x, y)
+            elif (
+                drawn != length
+                or length >= self.history_limit
+                or cache.get('target') != target
+                or cache.get('last') != float(values[-1])
+            ):
+                xs, ys = self._decimate(values, target)
+                # Uma única chamada replace() por série evita N cruzamentos Python->C++
+                # e N sinais de pointAdded durante o redesenho
+                series.replace([QPointF(x, y) for x, y in zip(xs.tolist(), ys.tolist())])
+            # Só há anexação incremental enquanto os pontos são as próprias amostras
+            cache['samples'] = length if length <= target else None
+            cache['last'] = float(values[-1])
+            cache['target'] = target
+
+            if forecast is None:
+                forecast = EMPTY_FORECAST
+            if cache.get('forecast') is not forecast or cache.get('forecast_offset') != length:
+                forecast_values = np.asarray(forecast, dtype=np.float32)
+                forecast_values = forecast_values[~np.isnan(forecast_values)]
                 if forecast_series is not None:
-                    forecast_series.append(offset, value)
+                    forecast_series.replace([
+                        QPointF(offset, value)
+                        for offset, value in enumerate(forecast_values.tolist(), start=length)
+                    ])
+                cache['forecast'] = forecast
+                cache['forecast_offset'] = length
+                cache['forecast_size'] = forecast_values.size
+                cache['forecast_bounds'] = (
+                    (float(forecast_values.min()), float(forecast_values.max()))
+                    if forecast_values.size else None
+                )
 
-            total_length = len(values) + len(forecast_values)
+            total_length = length + cache['forecast_size']
             if total_length <= 0:
                 total_length = 1
-            axis_x.setRange(0, max(total_length, self.forecast_horizon))
-            axis_x.setTickCount(min(10, total_length + 1))
-
-            combined_values = values + forecast_values
-            min_val = min(combined_values)
-            max_val = max(combined_values)
+            x_range = (0, max(total_length, self.forecast_horizon), min(10, total_length + 1))
+            if cache.get('x_range') != x_range:
+                axis_x.setRange(x_range[0], x_range[1])
+                axis_x.setTickCount(x_range[2])
+                cache['x_range'] = x_range
+
+            min_val = float(values.min())
+            max_val = float(values.max())
+            forecast_bounds = cache['forecast_bounds']
+            if forecast_bounds is not None:
+                min_val = min(min_val, forecast_bounds[0])
+                max_val = max(max_val, forecast_bounds[1])
             if min_val == max_val:
                 padding = max(5, min_val * 0.1)
-                axis_y.setRange(max(default_min, min_val - padding), min(default_max, max_val + padding))
             else:
                 padding = max(3, (max_val - min_val) * 0.1)
-                axis_y.setRange(max(default_min, min_val - padding), min(default_max, max_val + padding))
+            y_range = (max(default_min, min_val - padding), min(default_max, max_val + padding))
+            if cache.get('y_range') != y_range:
+                axis_y.setRange(*y_range)
+                cache['y_range'] = y_range
         else:
+            cache.clear()
+            series.clear()
+            if forecast_series is not None:
+                forecast_series.clear()
             axis_x.setRange(0, self.history_limit)
             axis_x.setTickCount(6)
             axis_y.setRange(default_min, default_max)
@@ -960,18 +1818,41 @@ class MainWindow(QMainWindow):
         self.map_view = QWebEngineView()
         self.map_view.setMinimumHeight(600)
         
+        # Perfil persistente com cache HTTP em disco: o Leaflet da CDN vem do disco
+        # nas próximas execuções (o perfil padrão do setHtml não guarda cache)
+        cacheRoot = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+        self.map_profile = QWebEngineProfile("dashboard-map", self)
+        self.map_profile.setCachePath(os.path.join(cacheRoot, "qtwebcache"))
+        self.map_profile.setPersistentStoragePath(os.path.join(cacheRoot, "qtwebstorage"))
+        self.map_profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        self.map_profile.setHttpCacheMaximumSize(50 * 1024 * 1024)
+        self.map_view.setPage(QWebEnginePage(self.map_profile, self.map_view))
+        
         # Configura WebChannel para comunicação JavaScript <-> Python
         self.map_channel = QWebChannel()
-        self.map_channel.registerObject("pybridge", self)
+        self.map_bridge = MapBridge(self)
+        self.map_channel.registerObject("pybridge", self.map_bridge)
         self.map_view.page().setWebChannel(self.map_channel)
         
-        initial_map = self.generate_all_racks_map_html()
-        self.map_view.setHtml(initial_map)
+        # A página é carregada uma única vez; o estado inicial vem de mapReady()
+        # e depois só lotes de diffs via sinal racksUpdated
+        self._map_ready = False
+        self._map_features = {}
+        self._map_selected = None
+        # Origem https fixa: o cache HTTP é particionado pela origem da página
+        self.map_view.setHtml(self.generate_map_shell_html(), QUrl(MAP_BASE_URL))
         layout.addWidget(self.map_view)
         
         return section
     
-    @pyqtSlot(str)
+    def _add_rack_list_item(self, rack_id: str):
+        """Adiciona o rack à lista lateral (uma vez) e indexa o item por ``rack_id``."""
+        if rack_id in self._rack_list_items:
+            return
+        item = QListWidgetItem(f"Rack {rack_id}")
+        self.list_widget.addItem(item)
+        self._rack_list_items[rack_id] = item
+
     def selectRackFromMap(self, rack_id: str):
         """
         Callback chamado pelo JavaScript quando um rack é clicado no mapa.
@@ -980,220 +1861,206 @@ class MainWindow(QMainWindow):
         Args:
             rack_id: ID do rack clicado
         """
-        print(f"[UI/Map] 📍 Rack {rack_id} clicado no mapa")
+        logger.info("[UI/Map] 📍 Rack %s clicado no mapa", rack_id)
         
         # Encontra o item na lista
-        items = self.list_widget.findItems(f"Rack {rack_id}", Qt.MatchExactly)
-        if items:
-            self.list_widget.setCurrentItem(items[0])
+        item = self._rack_list_items.get(rack_id)
+        if item is not None:
+            self.list_widget.setCurrentItem(item)
     
-    def generate_all_racks_map_html(self, selected_rack_id: str = None) -> str:
+    def rack_feature(self, rack_id: str):
         """
-        Gera o HTML para exibir o mapa com TODOS os racks simultaneamente.
+        Retorna o rack como ``Feature`` GeoJSON (Point), ou None sem coordenadas.
+        
+        As propriedades usam chaves curtas (``t``, ``h``, ``d``, ``v``, ``b``);
+        o HTML do popup é montado no JavaScript só quando o popup é aberto.
+        Valores vão com a precisão exibida no popup (0,1 para temperatura e
+        umidade, 6 casas nas coordenadas): oscilações invisíveis não geram diff.
+        """
+        state = self.rack_states.get(rack_id)
+        if state is None:
+            return None
+        lat = state.get('latitude')
+        lon = state.get('longitude')
+        if lat is None or lon is None:
+            return None
+        temp = state.get('temperature')
+        hum = state.get('humidity')
+        return {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [round(lon, 6), round(lat, 6)]},
+            'properties': {
+                'id': rack_id,
+                't': None if temp is None else round(temp, 1),
+                'h': None if hum is None else round(hum, 1),
+                'd': state.get('door_status'),
+                'v': state.get('ventilation_status'),
+                'b': state.get('buzzer_status'),
+            },
+        }
+
+    def set_rack_location(self, state, lat, lon):
+        """Atualiza as coordenadas do rack mantendo as somas do centróide do mapa."""
+        old_lat = state.get('latitude')
+        old_lon = state.get('longitude')
+        if old_lat is not None and old_lon is not None:
+            self._centroid_sum_lat -= old_lat
+            self._centroid_sum_lon -= old_lon
+            self._centroid_n -= 1
+        state['latitude'] = lat
+        state['longitude'] = lon
+        if lat is not None and lon is not None:
+            self._centroid_sum_lat += lat
+            self._centroid_sum_lon += lon
+            self._centroid_n += 1
+
+    def generate_map_shell_html(self) -> str:
+        """
+        Gera o HTML da página do mapa, carregada uma única vez.
         
         OpenStreetMap é um mapa opensource gratuito com licença ODbL.
         Leaflet.js é uma biblioteca JavaScript opensource (BSD-2-Clause).
         
+        A página vem de ``MAP_HTML_TEMPLATE`` e não traz racks: ao conectar o
+        QWebChannel ela chama ``mapReady``, que devolve o ``FeatureCollection``
+        inicial, e depois recebe só lotes de diffs pelo sinal ``MapBridge.racksUpdated``
+        (aplicados por ``applyBatch``). Expõe em
+        ``window`` a API ``upsertRack``, ``removeRack``, ``setSelected`` e
+        ``centerOnRack``. Com mais de ``map_cluster_threshold`` racks eles são
+        agrupados num ``L.markerClusterGroup`` carregado em lotes
+        (``chunkedLoading``).
+        
+        Returns:
+            HTML completo com mapa Leaflet/OpenStreetMap
+        """
+        # qwebchannel.js é embutido: a página tem origem https e não carrega qrc://
+        channelJs = QFile(":/qtwebchannel/qwebchannel.js")
+        if channelJs.open(QIODevice.ReadOnly):
+            qwebchannelScript = f"<script>{bytes(channelJs.readAll()).decode('utf-8')}</script>"
+            channelJs.close()
+        else:
+            qwebchannelScript = '<script src="qrc:///qtwebchannel/qwebchannel.js"></script>'
+        return MAP_HTML_TEMPLATE.substitute(
+            qwebchannel_script=qwebchannelScript,
+            cluster_threshold=self.map_cluster_threshold
+        )
+
+    def map_initial_state(self, selected_rack_id: str = None) -> dict:
+        """
+        Monta a carga inicial do mapa: racks, seleção e enquadramento.
+        
         Args:
             selected_rack_id: ID do rack atualmente selecionado (para destacar)
             
         Returns:
-            HTML completo com mapa Leaflet/OpenStreetMap e todos os racks
+            ``{'data': FeatureCollection, 'selected', 'center': [lat, lon], 'zoom'}``
         """
         # Centro de Fortaleza-CE como padrão
         default_lat = -3.7319
         default_lon = -38.5267
         
         # Coleta todos os racks com coordenadas
-        racks_data = []
-        for rack_id, state in self.rack_states.items():
-            lat = state.get('latitude')
-            lon = state.get('longitude')
-            if lat is not None and lon is not None:
-                racks_data.append({
-                    'id': rack_id,
-                    'lat': lat,
-                    'lon': lon,
-                    'state': state
-                })
-        
-        # Determina centro e zoom
-        if selected_rack_id and selected_rack_id in self.rack_states:
-            state = self.rack_states[selected_rack_id]
-            center_lat = state.get('latitude', default_lat)
-            center_lon = state.get('longitude', default_lon)
+        features = {}
+        for rack_id in self.rack_states:
+            feature = self.rack_feature(rack_id)
+            if feature is not None:
+                features[rack_id] = feature
+        self._map_features = features
+        
+        # Determina centro e zoom (GeoJSON usa [lon, lat])
+        if selected_rack_id and selected_rack_id in features:
+            center_lon, center_lat = features[selected_rack_id]['geometry']['coordinates']
             zoom = 14
-        elif racks_data:
-            # Centraliza na média de todos os racks
-            center_lat = sum(r['lat'] for r in racks_data) / len(racks_data)
-            center_lon = sum(r['lon'] for r in racks_data) / len(racks_data)
+        elif self._centroid_n:
+            # Centraliza na média de todos os racks (somas mantidas por set_rack_location)
+            center_lat = self._centroid_sum_lat / self._centroid_n
+            center_lon = self._centroid_sum_lon / self._centroid_n
             zoom = 12
         else:
             center_lat = default_lat
             center_lon = default_lon
             zoom = 12
         
-        # Gera JavaScript para cada marcador
-        markers_js = ""
-        for rack in racks_data:
-            rid = rack['id']
-            rlat = rack['lat']
-            rlon = rack['lon']
-            rstate = rack['state']
-            is_selected = rid == selected_rack_id
-            
-            # Monta conteúdo do popup
-            popup_lines = [f"<b>🖥️ Rack {rid}</b>"]
-            
-            temp = rstate.get('temperature')
-            if temp is not None:
-                temp_icon = "🔥" if temp > 35 else "❄️" if temp < 18 else "🌡️"
-                popup_lines.append(f"{temp_icon} Temp: {temp:.1f}°C")
-            
-            hum = rstate.get('humidity')
-            if hum is not None:
-                hum_icon = "💧" if hum > 70 else "🏜️" if hum < 30 else "💨"
-                popup_lines.append(f"{hum_icon} Umidade: {hum:.1f}%")
-            
-            door = rstate.get('door_status')
-            if door is not None:
-                door_text = "ABERTA" if door == 1 else "FECHADA"
-                door_icon = "🚪" if door == 1 else "🔒"
-                popup_lines.append(f"{door_icon} Porta: {door_text}")
-            
-            vent = rstate.get('ventilation_status')
-            if vent is not None:
-                vent_text = "LIGADA" if vent == 1 else "DESLIGADA"
-                vent_icon = "💨" if vent == 1 else "🛑"
-                popup_lines.append(f"{vent_icon} Ventilação: {vent_text}")
-            
-            buzzer = rstate.get('buzzer_status')
-            if buzzer is not None and buzzer > 0:
-                buzzer_states = {1: '🔔 Porta Aberta', 2: '🚨 ARROMBAMENTO', 3: '🔥 SUPERAQUECIMENTO'}
-                popup_lines.append(buzzer_states.get(buzzer, ''))
-            
-            popup_lines.append(f"<small>📍 {rlat:.6f}, {rlon:.6f}</small>")
-            popup_content = "<br>".join(popup_lines)
-            
-            # Cor do marcador: azul escuro para selecionado, azul claro para outros
-            bg_color = "#2c3e50" if is_selected else "#3498db"
-            border = "3px solid #f39c12" if is_selected else "none"
-            
-            markers_js += f"""
-                (function() {{
-                    var rackIcon = L.divIcon({{
-                        className: 'rack-marker',
-                        html: '<div style="background-color: {bg_color}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold; font-size: 11px; box-shadow: 0 2px 5px rgba(0,0,0,0.3); border: {border}; cursor: pointer;">🖥️ {rid}</div>',
-                        iconSize: [80, 25],
-                        iconAnchor: [40, 25],
-                        popupAnchor: [0, -25]
-                    }});
-                    var marker = L.marker([{rlat}, {rlon}], {{icon: rackIcon}}).addTo(map);
-                    marker.bindPopup("{popup_content}");
-                    marker.on('click', function() {{
-                        if (window.pybridge) {{
-                            window.pybridge.selectRackFromMap("{rid}");
-                        }}
-                    }});
-                    markers["{rid}"] = marker;
-                    {"marker.openPopup();" if is_selected else ""}
-                }})();
-            """
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Mapa dos Racks</title>
-            <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" 
-                  integrity="sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY=" 
-                  crossorigin=""/>
-            <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js" 
-                    integrity="sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo=" 
-                    crossorigin=""></script>
-            <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
-            <style>
-                html, body {{
-                    margin: 0;
-                    padding: 0;
-                    height: 100%;
-                    width: 100%;
-                }}
-                #map {{
-                    height: 100%;
-                    width: 100%;
-                    border-radius: 10px;
-                }}
-                .leaflet-control-attribution {{
-                    font-size: 10px;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="map"></div>
-            <script>
-                // Inicializa o mapa centrado em Fortaleza-CE, Brasil
-                var map = L.map('map').setView([{center_lat}, {center_lon}], {zoom});
-                var markers = {{}};
-                
-                // Tiles do OpenStreetMap (ODbL License)
-                L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-                    maxZoom: 19,
-                    attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
-                }}).addTo(map);
-                
-                // Configura comunicação com Python via WebChannel
-                new QWebChannel(qt.webChannelTransport, function(channel) {{
-                    window.pybridge = channel.objects.pybridge;
-                }});
-                
-                // Adiciona marcadores para todos os racks
-                {markers_js}
-                
-                // Função para centralizar no rack (chamada pelo Python)
-                window.centerOnRack = function(rackId) {{
-                    if (markers[rackId]) {{
-                        map.setView(markers[rackId].getLatLng(), 14);
-                        markers[rackId].openPopup();
-                    }}
-                }};
-            </script>
-        </body>
-        </html>
-        """
-        return html
-    
-    def update_map_view(self, rack_id: str = None, force: bool = False):
+        return {
+            'data': {'type': 'FeatureCollection', 'features': list(features.values())},
+            'selected': selected_rack_id,
+            'center': [center_lat, center_lon],
+            'zoom': zoom,
+        }
+
+    def mapReady(self):
+        """
+        Chamado pelo JavaScript (via ``MapBridge``) quando o QWebChannel conecta.
+        
+        Devolve o estado inicial em JSON; a partir daqui os marcadores são
+        enviados como diffs. Se a página for recarregada, a carga é refeita.
+        """
+        self._map_dirty.clear()
+        self._structure_dirty = False
+        self._map_selected = self.current_rack_id
+        self._map_ready = True
+        state = self.map_initial_state(self.current_rack_id)
+        logger.info("[UI/Map] 🗺️ Mapa carregado com %d racks", len(state['data']['features']))
+        return dumps_json(state)
+
+    def rack_marker_diff(self, rack_id: str):
+        """
+        Retorna a ``Feature`` a enviar ao mapa para um rack, ou None se não mudou.
+        
+        Um rack novo ou alterado volta com a ``Feature`` atual; um rack exibido
+        que perdeu as coordenadas volta com ``geometry`` nula, para ser removido.
+        """
+        feature = self.rack_feature(rack_id)
+        if feature is None:
+            if self._map_features.pop(rack_id, None) is not None:
+                return {'type': 'Feature', 'geometry': None, 'properties': {'id': rack_id}}
+            return None
+        if self._map_features.get(rack_id) == feature:
+            return None
+        self._map_features[rack_id] = feature
+        return feature
+
+    def update_map_view(self, rack_id: str = None):
         """
         Atualiza o mapa com todos os racks, destacando o selecionado.
         
-        O mapa só é atualizado se houver mudanças ou se force=True.
+        Os marcadores alterados entre os racks de ``_map_dirty`` e a troca de
+        seleção vão num único lote JSON pelo sinal ``racksUpdated`` (sem gerar
+        código para ``runJavaScript``); a página nunca é recarregada. Após uma
+        mudança na lista de racks (``_structure_dirty``) os racks exibidos que
+        perderam as coordenadas também são enviados, para serem removidos.
         
         Args:
             rack_id: ID do rack selecionado (para destacar e centralizar)
-            force: Força atualização mesmo se não houve mudanças
         """
         if not hasattr(self, 'map_view') or self.map_view is None:
             return
-        
-        # Gera hash do estado atual para detectar mudanças
-        current_hash = hash((rack_id, len(self.rack_states), str(sorted(self.rack_states.keys()))))
-        last_hash = getattr(self, '_last_map_hash', None)
-        
-        if not force and last_hash == current_hash:
-            # Nenhuma mudança, apenas centraliza no rack se necessário
-            if rack_id:
-                self.map_view.page().runJavaScript(f'if(window.centerOnRack) centerOnRack("{rack_id}");')
+        if not self._map_ready:
+            # mapReady() envia o estado completo quando a página terminar de carregar
+            return
+        if not (self._map_dirty or self._structure_dirty or rack_id != self._map_selected):
             return
         
-        # Armazena hash atual
-        self._last_map_hash = current_hash
-        
-        map_html = self.generate_all_racks_map_html(rack_id)
-        self.map_view.setHtml(map_html)
-        print(f"[UI/Map] 🗺️ Mapa atualizado com {len(self.rack_states)} racks")
+        dirty = self._map_dirty
+        self._map_dirty = set()
+        if self._structure_dirty:
+            self._structure_dirty = False
+            dirty.update(
+                rid for rid in self._map_features
+                if self.rack_states.get(rid, {}).get('latitude') is None
+                or self.rack_states.get(rid, {}).get('longitude') is None
+            )
+        if rack_id:
+            dirty.add(rack_id)
+        batch = {'features': [
+            diff for diff in map(self.rack_marker_diff, dirty) if diff is not None
+        ]}
+        if rack_id != self._map_selected:
+            # Seleção mudou: troca destaque e centraliza no novo rack
+            self._map_selected = rack_id
+            batch['selected'] = rack_id
+        if batch['features'] or 'selected' in batch:
+            self.map_bridge.racksUpdated.emit(dumps_json(batch))
     
     def create_status_bar(self):
         """Create status bar for AI actions display"""
@@ -1225,22 +2092,12 @@ class MainWindow(QMainWindow):
         
         # Status icon (animated)
         self.status_icon = QLabel("⏸️")
-        self.status_icon.setStyleSheet("""
-            QLabel {
-                color: #95a5a6;
-                font-size: 16px;
-            }
-        """)
+        self.status_icon.setStyleSheet(STATUS_ICON_IDLE_QSS)
         layout.addWidget(self.status_icon)
         
         # Status message
         self.status_message = QLabel("Aguardando dados...")
-        self.status_message.setStyleSheet("""
-            QLabel {
-                color: #ecf0f1;
-                font-size: 13px;
-            }
-        """)
+        self.status_message.setStyleSheet(STATUS_MESSAGE_IDLE_QSS)
         layout.addWidget(self.status_message, 1)
         
         # Last action info
@@ -1255,9 +2112,9 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.last_action_label)
         
         # Thresholds info
-        tempHigh = os.getenv("TEMP_HIGH_THRESHOLD", "35")
-        tempLow = os.getenv("TEMP_LOW_THRESHOLD", "28")
-        thresholds_label = QLabel(f"🎚️ Histerese: {tempLow}°C ↔ {tempHigh}°C")
+        thresholds_label = QLabel(
+            f"🎚️ Histerese: {self.config.temp_low:g}°C ↔ {self.config.temp_high:g}°C"
+        )
         thresholds_label.setStyleSheet("""
             QLabel {
                 color: #7f8c8d;
@@ -1268,8 +2125,10 @@ class MainWindow(QMainWindow):
         
         return status_frame
     
-    def get_button_style(self, color):
-        """Get button stylesheet with specified color"""
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def get_button_style(color):
+        """Get button stylesheet with specified color (memoized: few distinct colors)"""
         return f"""
             QPushButton {{
                 background-color: {color};
@@ -1282,10 +2141,10 @@ class MainWindow(QMainWindow):
                 min-height: 40px;
             }}
             QPushButton:hover {{
-                background-color: {self.adjust_color(color, -20)};
+                background-color: {MainWindow.adjust_color(color, -20)};
             }}
             QPushButton:pressed {{
-                background-color: {self.adjust_color(color, -40)};
+                background-color: {MainWindow.adjust_color(color, -40)};
             }}
             QPushButton:disabled {{
                 background-color: #bdc3c7;
@@ -1293,7 +2152,9 @@ class MainWindow(QMainWindow):
             }}
         """
     
-    def adjust_color(self, hex_color, amount):
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def adjust_color(hex_color, amount):
         """Adjust hex color brightness"""
         hex_color = hex_color.lstrip('#')
         r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
@@ -1302,6 +2163,12 @@ class MainWindow(QMainWindow):
         b = max(0, min(255, b + amount))
         return f'#{r:02x}{g:02x}{b:02x}'
     
+    def apply_button_style(self, button, color):
+        """Apply the button stylesheet only if it changed (setStyleSheet re-polishes the widget)."""
+        style = self.get_button_style(color)
+        if button.styleSheet() != style:
+            button.setStyleSheet(style)
+
     def apply_stylesheet(self):
         """Apply global stylesheet"""
         self.setStyleSheet("""
@@ -1314,45 +2181,13 @@ class MainWindow(QMainWindow):
         """)
     
     def ensure_rack_state(self, rack_id):
-        """Ensure rack state cache exists for rack"""
-        if rack_id not in self.rack_states:
-            self.rack_states[rack_id] = {
-                'temperature': None,
-                'humidity': None,
-                'door_status': None,
-                'ventilation_status': None,
-                'buzzer_status': None,
-                # GPS data (padronizado com firmware)
-                'latitude': None,
-                'longitude': None,
-                'altitude': None,
-                'gps_time': None,
-                'gps_speed': None,
-                # Tilt sensor (padronizado com firmware)
-                'tilt': False,
-                # Historical data
-                'temperature_history': [],
-                'humidity_history': [],
-                'temperature_forecast': [],
-                'humidity_forecast': [],
-                'last_sample_timestamp': None
-            }
-        else:
-            state = self.rack_states[rack_id]
-            state.setdefault('temperature_history', [])
-            state.setdefault('humidity_history', [])
-            state.setdefault('temperature_forecast', [])
-            state.setdefault('humidity_forecast', [])
-            state.setdefault('last_sample_timestamp', None)
-            state.setdefault('latitude', None)
-            state.setdefault('longitude', None)
-            # GPS data adicional (padronizado com firmware)
-            state.setdefault('altitude', None)
-            state.setdefault('gps_time', None)
-            state.setdefault('gps_speed', None)
-            # Tilt sensor (padronizado com firmware)
-            state.setdefault('tilt', False)
-        return self.rack_states[rack_id]
+        """Ensure rack state cache exists for rack (a copy of ``RACK_STATE_DEFAULTS``)"""
+        state = self.rack_states.get(rack_id)
+        if state is None:
+            # Todos os estados nascem aqui com o conjunto completo de chaves:
+            # racks já conhecidos saem com um único lookup
+            state = self.rack_states[rack_id] = dict(RACK_STATE_DEFAULTS)
+        return state
 
     def getOrCreateRack(self, rackId: str) -> Rack:
         """
@@ -1376,6 +2211,10 @@ class MainWindow(QMainWindow):
             rack: Instância do Rack
             state: Dicionário de estado do rack
         """
+        revision = state['revision']
+        if self._rackSyncedRevision.get(rack.rackId) == revision:
+            return
+        self._rackSyncedRevision[rack.rackId] = revision
         if state.get('temperature') is not None:
             rack.temperature = state['temperature']
         if state.get('humidity') is not None:
@@ -1409,14 +2248,14 @@ class MainWindow(QMainWindow):
         O estado só será atualizado quando o firmware confirmar via ACK.
         """
         if not self.currentRack:
-            print("[UI/Warning] ⚠️  No rack selected")
+            logger.warning("[UI/Warning] ⚠️  No rack selected")
             return
         
         # Use the service to toggle door - UI update will happen on ACK
         success = self.rackControlService.toggleDoor(self.currentRack)
         
         if success:
-            print(f"[UI/Command] 🚀 Door command sent, awaiting firmware confirmation...")
+            logger.info("[UI/Command] 🚀 Door command sent, awaiting firmware confirmation...")
 
     def toggle_ventilation(self):
         """
@@ -1426,14 +2265,14 @@ class MainWindow(QMainWindow):
         O estado só será atualizado quando o firmware confirmar via ACK.
         """
         if not self.currentRack:
-            print("[UI/Warning] ⚠️  No rack selected")
+            logger.warning("[UI/Warning] ⚠️  No rack selected")
             return
         
         # Use the service to toggle ventilation - UI update will happen on ACK
         success = self.rackControlService.toggleVentilation(self.currentRack)
         
         if success:
-            print(f"[UI/Command] 🚀 Ventilation command sent, awaiting firmware confirmation...")
+            logger.info("[UI/Command] 🚀 Ventilation command sent, awaiting firmware confirmation...")
 
     def send_command(self, command_type, value):
         """
@@ -1446,7 +2285,7 @@ class MainWindow(QMainWindow):
         to RackControlService methods.
         """
         if not self.currentRack:
-            print("[UI/Warning] ⚠️  No rack selected")
+            logger.warning("[UI/Warning] ⚠️  No rack selected")
             return
         
         success = False
@@ -1471,34 +2310,29 @@ class MainWindow(QMainWindow):
                 success = self.rackControlService.activateBreakInAlert(self.currentRack)
         
         if success:
-            print(f"[UI/Command] 🚀 {command_type} command sent, awaiting firmware confirmation...")
+            logger.info("[UI/Command] 🚀 %s command sent, awaiting firmware confirmation...", command_type)
 
     def setup_mqtt(self):
         """Configure and connect to MQTT broker"""
         # Validate required environment variables
-        server = os.getenv("MQTT_SERVER")
-        if not server:
+        config = self.config
+        if not config.mqtt_server:
             raise ValueError("MQTT_SERVER not configured in .env file. Please copy .env.example to .env and configure it.")
         
-        username = os.getenv("MQTT_USERNAME")
-        password = os.getenv("MQTT_PASSWORD")
-        port = int(os.getenv("MQTT_PORT", 1883))
-        keepalive = int(os.getenv("MQTT_KEEPALIVE", 60))
-        
         # Use CallbackAPIVersion.VERSION2 to avoid deprecation warning
         self.client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
         
-        if username:
-            self.client.username_pw_set(username, password)
+        if config.mqtt_username:
+            self.client.username_pw_set(config.mqtt_username, config.mqtt_password)
         
         self.client.on_connect = self.on_connect
         self.client.on_message = self.on_message
-        self.client.connect(server, port, keepalive)
+        self.client.connect(config.mqtt_server, config.mqtt_port, config.mqtt_keepalive)
         self.client.loop_start()
 
     def on_connect(self, client, userdata, flags, rc, properties=None):
         """Callback when connected to MQTT broker (API v2)"""
-        print(f"[MQTT/Connection] 🔌 Connected with result code: {rc}")
+        logger.info("[MQTT/Connection] 🔌 Connected with result code: %s", rc)
         
         # Subscribe to all rack topics
         # Tópicos padronizados com o firmware (origem):
@@ -1524,16 +2358,19 @@ class MainWindow(QMainWindow):
             f"{base}/+/ack/buzzer",
         ]
         
+        # Um único pacote SUBSCRIBE com todos os filtros (um round-trip em vez de um por tópico)
+        client.subscribe([(topic, 0) for topic in topics])
         for topic in topics:
-            client.subscribe(topic)
-            print(f"[MQTT/Subscription] 📡 Subscribed to: {topic}")
+            logger.info("[MQTT/Subscription] 📡 Subscribed to: %s", topic)
 
     def on_message(self, client, userdata, msg):
         """Callback when message received from MQTT broker (MQTT thread)."""
-        print(f"[MQTT/Message] 📬 Received message on topic: {msg.topic}")
+        logger.debug("[MQTT/Message] 📬 Received message on topic: %s", msg.topic)
         try:
             topic = msg.topic
-            payload = msg.payload.decode()
+            # O payload segue em bytes: int()/float() e orjson.loads aceitam bytes
+            # diretamente, sem a cópia de um decode() por mensagem
+            payload = msg.payload
 
             prefix = f"{self.base_topic}/"
             if not topic.startswith(prefix):
@@ -1545,18 +2382,51 @@ class MainWindow(QMainWindow):
                 return
 
             rack_id = parts[0]
+            suffix = '/'.join(parts[1:])
+
+            # Enfileira para o thread da GUI, que drena o lote periodicamente
+            with self._rx_lock:
+                self._rx_batch.append({
+                    'topic': topic,
+                    'rack_id': rack_id,
+                    'suffix': suffix,
+                    'payload': payload,
+                })
 
-            # Delega o processamento para o thread da GUI via sinal Qt
-            self.message_received.emit({
-                'topic': topic,
-                'rack_id': rack_id,
-                'payload': payload,
-            })
+        except Exception:
+            self.log_exception_throttled("mqtt", "[MQTT/Error] ❌ Error processing message")
 
-        except Exception as e:
-            print(f"[MQTT/Error] ❌ Error processing message: {e}")
-            import traceback
-            traceback.print_exc()
+    def log_exception_throttled(self, source, message):
+        """
+        Log the current exception with traceback at most once per second per kind.
+
+        Um firmware com defeito pode gerar o mesmo erro a cada mensagem: as
+        repetições dentro do intervalo são só contadas e informadas no próximo log.
+        """
+        kind = (source, sys.exc_info()[0])
+        now = time.monotonic()
+        last, suppressed = self._error_log_state.get(kind, (0.0, 0))
+        if now - last < 1.0:
+            self._error_log_state[kind] = (last, suppressed + 1)
+            return
+        self._error_log_state[kind] = (now, 0)
+        if suppressed:
+            logger.exception("%s (%d similar errors suppressed)", message, suppressed)
+        else:
+            logger.exception(message)
+
+    def drain_rx_batch(self):
+        """Swap out the pending MQTT batch and dispatch it with a single signal emission."""
+        if not self._rx_batch:
+            return
+        with self._rx_lock:
+            batch, self._rx_batch = self._rx_batch, []
+        self.message_received.emit(batch)
+
+    def handle_message_batch(self, batch):
+        """Handle a batch of MQTT messages in GUI thread, in arrival order."""
+        for data in batch:
+            self.handle_message_update(data)
 
     def handle_message_update(self, data):
         """Handle MQTT message in GUI thread, updating state, DB and UI."""
@@ -1569,281 +2439,366 @@ class MainWindow(QMainWindow):
                 return
 
             # Ensure state cache
+            if rack_id not in self.rack_states:
+                self._structure_dirty = True
             state = self.ensure_rack_state(rack_id)
 
             # Add rack to list if not present and ensure Rack object exists
-            items = self.list_widget.findItems(f"Rack {rack_id}", Qt.MatchExactly)
-            if not items:
-                self.list_widget.addItem(f"Rack {rack_id}")
+            if rack_id not in self._rack_list_items:
+                self._add_rack_list_item(rack_id)
             
             # Get or create Rack object for this rack_id
             rack = self.getOrCreateRack(rack_id)
 
-            # Update state based on topic
-            if topic.endswith('/environment/door'):
-                # Estado da porta (lógica invertida no firmware - pull-up)
-                # 0 = fechada, 1 = aberta
-                raw_value = int(payload)
-                state['door_status'] = 1 if raw_value == 1 else 0
-                print(f"[MQTT/Environment] 🚪 Rack {rack_id} door: {'ABERTA' if state['door_status'] == 1 else 'FECHADA'}")
-
-            elif topic.endswith('/environment/temperature'):
-                temp_value = float(payload)
-                state['temperature'] = temp_value
-                # Append sample to temperature history for charts
-                self.append_history_sample(state, 'temperature_history', temp_value, time.time())
-                self.update_metric_forecast(state, 'temperature')
-                print(f"[MQTT/Environment] 🌡️ Rack {rack_id} temperature: {temp_value}°C")
-
-            elif topic.endswith('/environment/humidity'):
-                hum_value = float(payload)
-                state['humidity'] = hum_value
-                # Append sample to humidity history for charts
-                self.append_history_sample(state, 'humidity_history', hum_value, time.time())
-                self.update_metric_forecast(state, 'humidity')
-                print(f"[MQTT/Environment] 💧 Rack {rack_id} humidity: {hum_value}%")
-
-            elif topic.endswith('/command/door'):
-                # Porta só pode estar aberta (1) ou fechada (0)
-                raw_value = int(payload)
-                state['door_status'] = 1 if raw_value == 1 else 0
-                print(f"[MQTT/Command] 🚪 Rack {rack_id} door command: {'OPEN' if state['door_status'] == 1 else 'CLOSE'}")
-
-            elif topic.endswith('/command/ventilation'):
-                # Ventilação só pode estar ligada (1) ou desligada (0)
-                raw_value = int(payload)
-                state['ventilation_status'] = 1 if raw_value == 1 else 0
-                print(f"[MQTT/Command] 💨 Rack {rack_id} ventilation: {'ON' if state['ventilation_status'] == 1 else 'OFF'}")
-
-            elif topic.endswith('/command/buzzer'):
-                # Buzzer só aceita valores 0-3 (OFF, DOOR_OPEN, BREAK_IN, OVERHEAT)
-                raw_value = int(payload)
-                state['buzzer_status'] = raw_value if 0 <= raw_value <= 3 else 0
-                buzzer_states = {0: 'Desligado', 1: 'Porta Aberta', 2: 'Arrombamento', 3: 'Superaquecimento'}
-                print(f"[MQTT/Command] 🔔 Rack {rack_id} buzzer: {buzzer_states.get(state['buzzer_status'], 'Unknown')}")
-
-            elif topic.endswith('/gps'):
-                # Processa coordenadas GPS do rack (padronizado com firmware)
-                # Payload JSON: {latitude, longitude, altitude, time, speed}
-                try:
-                    import json
-                    gps_data = json.loads(payload)
-                    state['latitude'] = float(gps_data.get('latitude', 0))
-                    state['longitude'] = float(gps_data.get('longitude', 0))
-                    state['altitude'] = float(gps_data.get('altitude', 0))
-                    state['gps_time'] = int(gps_data.get('time', 0))
-                    state['gps_speed'] = float(gps_data.get('speed', 0))
-                    print(f"[MQTT/GPS] 📍 Rack {rack_id} GPS: lat={state['latitude']:.6f}, lon={state['longitude']:.6f}, alt={state['altitude']:.1f}m")
-                except (json.JSONDecodeError, ValueError, TypeError) as e:
-                    print(f"[MQTT/Error] ❌ Invalid GPS data for rack {rack_id}: {e}")
-            
-            elif topic.endswith('/tilt'):
-                # Processa estado de inclinação do rack (padronizado com firmware)
-                # Payload: "1" = inclinado, "0" = normal
-                tilt_value = int(payload)
-                state['tilt'] = tilt_value == 1
-                print(f"[MQTT/Tilt] ⚠️ Rack {rack_id} tilt: {'INCLINADO' if state['tilt'] else 'NORMAL'}")
-                if state['tilt']:
-                    print(f"[MQTT/Tilt] 🚨 ALERTA: Rack {rack_id} está inclinado!")
-            
-            # Processa confirmações (ACK) do firmware
-            elif topic.endswith('/ack/door'):
-                # Confirmação de comando de porta recebida do firmware
-                raw_value = int(payload)
-                state['door_status'] = 1 if raw_value == 1 else 0
-                rack.doorStatus = DoorStatus(state['door_status'])
-                self.rackControlService.processAck(rack_id, "door", raw_value)
-                print(f"[MQTT/ACK] ✅ Rack {rack_id} door ACK: {'OPEN' if state['door_status'] == 1 else 'CLOSED'}")
-            
-            elif topic.endswith('/ack/ventilation'):
-                # Confirmação de comando de ventilação recebida do firmware
-                raw_value = int(payload)
-                state['ventilation_status'] = 1 if raw_value == 1 else 0
-                rack.ventilationStatus = VentilationStatus(state['ventilation_status'])
-                self.rackControlService.processAck(rack_id, "ventilation", raw_value)
-                print(f"[MQTT/ACK] ✅ Rack {rack_id} ventilation ACK: {'ON' if state['ventilation_status'] == 1 else 'OFF'}")
-            
-            elif topic.endswith('/ack/buzzer'):
-                # Confirmação de comando de buzzer recebida do firmware
-                raw_value = int(payload)
-                state['buzzer_status'] = raw_value if 0 <= raw_value <= 3 else 0
-                rack.buzzerStatus = BuzzerStatus(state['buzzer_status'])
-                self.rackControlService.processAck(rack_id, "buzzer", raw_value)
-                buzzer_states = {0: 'Desligado', 1: 'Porta Aberta', 2: 'Arrombamento', 3: 'Superaquecimento'}
-                print(f"[MQTT/ACK] ✅ Rack {rack_id} buzzer ACK: {buzzer_states.get(state['buzzer_status'], 'Unknown')}")
+            # Update state based on topic: um lookup pelo sufixo em vez de N endswith()
+            handler = self._topic_handlers.get(data.get('suffix'))
+            if handler is not None:
+                handler(rack_id, payload, state, rack)
 
             # Sync Rack object with updated state
             self.syncRackFromState(rack, state)
 
-            # Save to database
+            # Database and AI telemetry get one merged update per debounce window
+            self._dirty_racks.add(rack_id)
+            if not self._persist_timer.isActive():
+                self._persist_timer.start()
+
+            # Only this rack's marker is re-sent to the map on the next flush
+            self._map_dirty.add(rack_id)
+
+            # If this rack is currently selected, refresh UI and charts on the next flush
+            self.mark_ui_dirty(rack_id)
+
+        except Exception:
+            self.log_exception_throttled("gui", "[UI/Error] ❌ Error handling MQTT update in GUI thread")
+
+    def _on_environment_door(self, rack_id, payload, state, rack):
+        """Estado da porta reportado pelo sensor."""
+        # Estado da porta (lógica invertida no firmware - pull-up)
+        # 0 = fechada, 1 = aberta
+        raw_value = int(payload)
+        state['door_status'] = int(raw_value == 1)
+        state['revision'] += 1
+        logger.debug("[MQTT/Environment] 🚪 Rack %s door: %s", rack_id, DOOR_STATE_NAMES[state['door_status']])
+
+    def _on_temperature(self, rack_id, payload, state, rack):
+        """Leitura de temperatura: estado, histórico e previsão."""
+        temp_value = float(payload)
+        state['temperature'] = temp_value
+        state['revision'] += 1
+        # Append sample to temperature history for charts
+        self.append_history_sample(state, 'temperature_history', temp_value, time.time())
+        self.update_metric_forecast(state, 'temperature')
+        logger.debug("[MQTT/Environment] 🌡️ Rack %s temperature: %s°C", rack_id, temp_value)
+
+    def _on_humidity(self, rack_id, payload, state, rack):
+        """Leitura de umidade: estado, histórico e previsão."""
+        hum_value = float(payload)
+        state['humidity'] = hum_value
+        state['revision'] += 1
+        # Append sample to humidity history for charts
+        self.append_history_sample(state, 'humidity_history', hum_value, time.time())
+        self.update_metric_forecast(state, 'humidity')
+        logger.debug("[MQTT/Environment] 💧 Rack %s humidity: %s%%", rack_id, hum_value)
+
+    def _on_command_door(self, rack_id, payload, state, rack):
+        """Comando de porta publicado no broker."""
+        # Porta só pode estar aberta (1) ou fechada (0)
+        raw_value = int(payload)
+        state['door_status'] = int(raw_value == 1)
+        state['revision'] += 1
+        logger.info("[MQTT/Command] 🚪 Rack %s door command: %s", rack_id, ('CLOSE', 'OPEN')[state['door_status']])
+
+    def _on_command_ventilation(self, rack_id, payload, state, rack):
+        """Comando de ventilação publicado no broker."""
+        # Ventilação só pode estar ligada (1) ou desligada (0)
+        raw_value = int(payload)
+        state['ventilation_status'] = int(raw_value == 1)
+        state['revision'] += 1
+        logger.info("[MQTT/Command] 💨 Rack %s ventilation: %s", rack_id, ('OFF', 'ON')[state['ventilation_status']])
+
+    def _on_command_buzzer(self, rack_id, payload, state, rack):
+        """Comando de buzzer publicado no broker."""
+        # Buzzer só aceita valores 0-3 (OFF, DOOR_OPEN, BREAK_IN, OVERHEAT);
+        # um único teste de bits descarta negativos e valores > 3
+        raw_value = int(payload)
+        state['buzzer_status'] = raw_value if not raw_value & ~3 else 0
+        state['revision'] += 1
+        logger.info("[MQTT/Command] 🔔 Rack %s buzzer: %s", rack_id, BUZZER_STATE_NAMES.get(state['buzzer_status'], 'Unknown'))
+
+    def _on_gps(self, rack_id, payload, state, rack):
+        """Coordenadas GPS do rack."""
+        # Processa coordenadas GPS do rack (padronizado com firmware)
+        # Payload JSON: {latitude, longitude, altitude, time, speed}
+        try:
+            gps_data = loads_json(payload)
+            self.set_rack_location(
+                state,
+                float(gps_data.get('latitude', 0)),
+                float(gps_data.get('longitude', 0))
+            )
+            state['altitude'] = float(gps_data.get('altitude', 0))
+            state['gps_time'] = int(gps_data.get('time', 0))
+            state['gps_speed'] = float(gps_data.get('speed', 0))
+            logger.debug(
+                "[MQTT/GPS] 📍 Rack %s GPS: lat=%.6f, lon=%.6f, alt=%.1fm",
+                rack_id, state['latitude'], state['longitude'], state['altitude']
+            )
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            logger.warning("[MQTT/Error] ❌ Invalid GPS data for rack %s: %s", rack_id, e)
+
+    def _on_tilt(self, rack_id, payload, state, rack):
+        """Sensor de inclinação do rack."""
+        # Processa estado de inclinação do rack (padronizado com firmware)
+        # Payload: "1" = inclinado, "0" = normal
+        tilt_value = int(payload)
+        state['tilt'] = tilt_value == 1
+        logger.debug("[MQTT/Tilt] ⚠️ Rack %s tilt: %s", rack_id, 'INCLINADO' if state['tilt'] else 'NORMAL')
+        if state['tilt']:
+            logger.warning("[MQTT/Tilt] 🚨 ALERTA: Rack %s está inclinado!", rack_id)
+
+    def _on_ack_door(self, rack_id, payload, state, rack):
+        """ACK do firmware para comando de porta."""
+        # Confirmação de comando de porta recebida do firmware
+        raw_value = int(payload)
+        state['door_status'] = int(raw_value == 1)
+        state['revision'] += 1
+        rack.doorStatus = DoorStatus(state['door_status'])
+        self.rackControlService.processAck(rack_id, "door", raw_value)
+        logger.info("[MQTT/ACK] ✅ Rack %s door ACK: %s", rack_id, ('CLOSED', 'OPEN')[state['door_status']])
+
+    def _on_ack_ventilation(self, rack_id, payload, state, rack):
+        """ACK do firmware para comando de ventilação."""
+        # Confirmação de comando de ventilação recebida do firmware
+        raw_value = int(payload)
+        state['ventilation_status'] = int(raw_value == 1)
+        state['revision'] += 1
+        rack.ventilationStatus = VentilationStatus(state['ventilation_status'])
+        self.rackControlService.processAck(rack_id, "ventilation", raw_value)
+        logger.info("[MQTT/ACK] ✅ Rack %s ventilation ACK: %s", rack_id, ('OFF', 'ON')[state['ventilation_status']])
+
+    def _on_ack_buzzer(self, rack_id, payload, state, rack):
+        """ACK do firmware para comando de buzzer."""
+        # Confirmação de comando de buzzer recebida do firmware
+        raw_value = int(payload)
+        state['buzzer_status'] = raw_value if not raw_value & ~3 else 0
+        state['revision'] += 1
+        rack.buzzerStatus = BuzzerStatus(state['buzzer_status'])
+        self.rackControlService.processAck(rack_id, "buzzer", raw_value)
+        logger.info("[MQTT/ACK] ✅ Rack %s buzzer ACK: %s", rack_id, BUZZER_STATE_NAMES.get(state['buzzer_status'], 'Unknown'))
+
+    def _flush_dirty_racks(self):
+        """Persist and forward the merged state of every rack updated since the last flush."""
+        dirty = self._dirty_racks
+        self._dirty_racks = set()
+        for rack_id in dirty:
             self.save_rack_state(rack_id)
 
             # Send telemetry to ToolCallingService for AI analysis
             if self.toolCallingService:
-                self.toolCallingService.updateTelemetry(rack_id, state)
+                self.forward_ai_telemetry(rack_id, self.rack_states[rack_id])
 
-            # If this rack is currently selected, refresh UI and charts immediately
-            if self.current_rack_id == rack_id:
-                self.update_ui_from_state(rack_id)
+    def forward_ai_telemetry(self, rack_id, state):
+        """
+        Forward the rack state to the AI service when a decision-relevant field changed.
 
-        except Exception as e:
-            print(f"[UI/Error] ❌ Error handling MQTT update in GUI thread: {e}")
-            import traceback
-            traceback.print_exc()
+        Leituras repetidas só são reenviadas uma vez por ciclo de análise, para
+        que a janela de tendência do serviço continue avançando.
+        """
+        temp = state.get('temperature')
+        hum = state.get('humidity')
+        key = (
+            None if temp is None else round(temp, 1),
+            None if hum is None else round(hum, 1),
+            state.get('door_status'),
+            state.get('ventilation_status'),
+            state.get('buzzer_status'),
+            state.get('tilt'),
+        )
+        now = time.monotonic()
+        last = self._last_ai_state.get(rack_id)
+        if last is not None and last[0] == key and now - last[1] < self.ai_telemetry_refresh_seconds:
+            return
+        self._last_ai_state[rack_id] = (key, now)
+        self.toolCallingService.updateTelemetry(rack_id, state)
+
+    def mark_ui_dirty(self, rack_id):
+        """Flag a rack for redraw and schedule a coalesced UI flush."""
+        self._ui_dirty.add(rack_id)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Arm a single-shot flush timer unless one is already pending."""
+        if self._ui_flush_pending:
+            return
+        self._ui_flush_pending = True
+        QTimer.singleShot(self.ui_flush_interval_ms, self._flush_ui)
+
+    def _flush_ui(self):
+        """Redraw the selected rack once if it changed since the last flush."""
+        self._ui_flush_pending = False
+        dirty = self._ui_dirty
+        self._ui_dirty = set()
+        if self.current_rack_id in dirty:
+            self.update_ui_from_state(self.current_rack_id)
+        if self._map_dirty or self._structure_dirty:
+            self.schedule_map_refresh()
+
+    def schedule_map_refresh(self):
+        """Arma o timer de debounce do mapa, se ainda não estiver ativo."""
+        if not self._map_refresh_timer.isActive():
+            self._map_refresh_timer.start()
+
+    def _flush_map_updates(self):
+        """Envia ao mapa os marcadores sujos e a seleção atual de uma só vez."""
+        self.update_map_view(self.current_rack_id)
 
     def update_ui_from_state(self, rack_id, refresh_charts=True):
-        """Update UI from rack state cache"""
+        """Update UI from rack state cache, touching only widgets whose value changed"""
         try:
-            if rack_id not in self.rack_states:
+            state = self.rack_states.get(rack_id)
+            if state is None:
                 return
 
-            state = self.rack_states[rack_id]
+            door = state['door_status']
+            temp = state['temperature']
+            hum = state['humidity']
+            vent = state['ventilation_status']
+            buzzer = state['buzzer_status']
+            # Valores como aparecem na tela: leituras com a mesma casa decimal não repintam
+            view = (
+                rack_id,
+                door,
+                None if temp is None else round(temp, 1),
+                None if hum is None else round(hum, 1),
+                vent,
+                buzzer,
+            )
+            rendered = self._last_rendered
+            if rendered.get('view') == view and not refresh_charts:
+                return
 
             # Update header
-            self.id_label.setText(f"🖥️ Rack {rack_id}")
-
-            # Update door status
-            if state['door_status'] is not None:
-                if state['door_status'] == 1:
-                    self.door_status_label.setText("🚪 Porta: ABERTA")
-                    self.door_status_label.setStyleSheet(
-                        """
-                        QLabel {
-                            color: white;
-                            font-size: 16px;
-                            padding: 10px 20px;
-                            background-color: #27ae60;
-                            border-radius: 5px;
-                        }
-                        """
-                    )
+            if rendered.get('rack') != rack_id:
+                rendered.clear()
+                rendered['rack'] = rack_id
+                self.id_label.setText(f"🖥️ Rack {rack_id}")
+
+            # Update door status and door button appearance
+            if door is not None and rendered.get('door') != door:
+                rendered['door'] = door
+                text, qss = DOOR_STYLES[1 if door == 1 else 0]
+                self.door_status_label.setText(text)
+                self.door_status_label.setStyleSheet(qss)
+                if door == 1:
+                    self.btn_door_toggle.setText("🚪 Fechar Porta")
+                    self.apply_button_style(self.btn_door_toggle, "#27ae60")
                 else:
-                    self.door_status_label.setText("🔒 Porta: FECHADA")
-                    self.door_status_label.setStyleSheet(
-                        """
-                        QLabel {
-                            color: white;
-                            font-size: 16px;
-                            padding: 10px 20px;
-                            background-color: #c0392b;
-                            border-radius: 5px;
-                        }
-                        """
-                    )
+                    self.btn_door_toggle.setText("🚪 Abrir Porta")
+                    self.apply_button_style(self.btn_door_toggle, "#c0392b")
 
             # Update temperature
-            if state['temperature'] is not None:
-                temp = state['temperature']
-                temp_int = int(round(temp))
-                temp_clamped = max(self.temp_gauge.minValue, min(self.temp_gauge.maxValue, temp_int))
-                self.temp_gauge.setValue(temp_clamped)
-                self.temp_value_label.setText(f"{temp:.1f} °C")
+            if temp is not None:
+                if rendered.get('temperature') != view[2]:
+                    rendered['temperature'] = view[2]
+                    temp_clamped = int(round(temp))
+                    gauge_min, gauge_max = self._temp_gauge_min, self._temp_gauge_max
+                    if temp_clamped > gauge_max:
+                        temp_clamped = gauge_max
+                    elif temp_clamped < gauge_min:
+                        temp_clamped = gauge_min
+                    # O ponteiro só anda em graus inteiros: décimos não repintam o gauge
+                    if rendered.get('temperature_gauge') != temp_clamped:
+                        rendered['temperature_gauge'] = temp_clamped
+                        self.temp_gauge.setValue(temp_clamped)
+                    self.temp_value_label.setText(f"{temp:.1f} °C")
                 if refresh_charts:
                     self.update_chart(
                         self.temp_series,
                         self.temp_forecast_series,
                         self.temp_axis_x,
                         self.temp_axis_y,
-                        state.get('temperature_history', []),
-                        state.get('temperature_forecast', []),
+                        self.ordered_view(state, 'temperature_history'),
+                        state.get('temperature_forecast', EMPTY_FORECAST),
                         default_min=0,
-                        default_max=100
+                        default_max=100,
+                        chart_view=self.temp_chart_view
                     )
 
             # Update humidity
-            if state['humidity'] is not None:
-                hum = state['humidity']
-                hum_int = int(round(hum))
-                hum_clamped = max(self.hum_gauge.minValue, min(self.hum_gauge.maxValue, hum_int))
-                self.hum_gauge.setValue(hum_clamped)
-                self.hum_value_label.setText(f"{hum:.1f} %")
+            if hum is not None:
+                if rendered.get('humidity') != view[3]:
+                    rendered['humidity'] = view[3]
+                    hum_clamped = int(round(hum))
+                    gauge_min, gauge_max = self._hum_gauge_min, self._hum_gauge_max
+                    if hum_clamped > gauge_max:
+                        hum_clamped = gauge_max
+                    elif hum_clamped < gauge_min:
+                        hum_clamped = gauge_min
+                    if rendered.get('humidity_gauge') != hum_clamped:
+                        rendered['humidity_gauge'] = hum_clamped
+                        self.hum_gauge.setValue(hum_clamped)
+                    self.hum_value_label.setText(f"{hum:.1f} %")
                 if refresh_charts:
                     self.update_chart(
                         self.hum_series,
                         self.hum_forecast_series,
                         self.hum_axis_x,
                         self.hum_axis_y,
-                        state.get('humidity_history', []),
-                        state.get('humidity_forecast', []),
+                        self.ordered_view(state, 'humidity_history'),
+                        state.get('humidity_forecast', EMPTY_FORECAST),
                         default_min=0,
-                        default_max=100
+                        default_max=100,
+                        chart_view=self.hum_chart_view
                     )
 
-            # Update door button appearance
-            if state['door_status'] is not None:
-                if state['door_status'] == 1:
-                    self.btn_door_toggle.setText("🚪 Fechar Porta")
-                    self.btn_door_toggle.setStyleSheet(self.get_button_style("#27ae60"))
-                else:
-                    self.btn_door_toggle.setText("🚪 Abrir Porta")
-                    self.btn_door_toggle.setStyleSheet(self.get_button_style("#c0392b"))
-
             # Update ventilation button appearance
-            if state['ventilation_status'] is not None:
-                if state['ventilation_status'] == 1:
+            if vent is not None and rendered.get('ventilation') != vent:
+                rendered['ventilation'] = vent
+                if vent == 1:
                     self.btn_vent_toggle.setText("💨 Desligar Ventilação")
-                    self.btn_vent_toggle.setStyleSheet(self.get_button_style("#3498db"))
+                    self.apply_button_style(self.btn_vent_toggle, "#3498db")
                 else:
                     self.btn_vent_toggle.setText("💨 Ligar Ventilação")
-                    self.btn_vent_toggle.setStyleSheet(self.get_button_style("#95a5a6"))
+                    self.apply_button_style(self.btn_vent_toggle, "#95a5a6")
 
             # Update buzzer status
-            if state['buzzer_status'] is not None:
-                buzzer_states = {
-                    0: ('🔕 Buzzer: Desligado', '#95a5a6'),
-                    1: ('🔔 Buzzer: Porta Aberta', '#f39c12'),
-                    2: ('🚨 Buzzer: ARROMBAMENTO', '#e74c3c'),
-                    3: ('🔥 Buzzer: SUPERAQUECIMENTO', '#e74c3c')
-                }
-                text, color = buzzer_states.get(state['buzzer_status'], ('🔔 Buzzer: --', '#95a5a6'))
+            if buzzer is not None and rendered.get('buzzer') != buzzer:
+                rendered['buzzer'] = buzzer
+                text, qss = BUZZER_STYLES.get(buzzer, BUZZER_UNKNOWN_STYLE)
                 self.buzzer_status_label.setText(text)
-                self.buzzer_status_label.setStyleSheet(
-                    f"""
-                    QLabel {{
-                        color: white;
-                        font-size: 16px;
-                        font-weight: bold;
-                        padding: 15px;
-                        background-color: {color};
-                        border-radius: 5px;
-                    }}
-                    """
-                )
+                self.buzzer_status_label.setStyleSheet(qss)
+
+            rendered['view'] = view
 
-            # Update map with all racks (only reloads if rack list changed)
-            self.update_map_view(rack_id)
+            # Update map: dirty markers and selection only (debounced)
+            self.schedule_map_refresh()
 
         except Exception as e:
-            print(f"[UI/Error] ❌ Error updating UI: {e}")
+            logger.error("[UI/Error] ❌ Error updating UI: %s", e)
 
     def save_rack_state(self, rack_id):
-        """Save rack state to database"""
+        """Queue rack state for the database writer thread"""
         try:
             if rack_id not in self.rack_states:
                 return
 
             state = self.rack_states[rack_id]
 
-            self.execute_db(
-                """
-                INSERT INTO rack_data 
-                (id, temperature, humidity, door_status, ventilation_status, buzzer_status, latitude, longitude) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    rack_id,
-                    state.get('temperature'),
-                    state.get('humidity'),
-                    state.get('door_status'),
-                    state.get('ventilation_status'),
-                    state.get('buzzer_status'),
-                    state.get('latitude'),
-                    state.get('longitude'),
-                ),
-                commit=True
-            )
+            # O instante é capturado aqui para não depender de quando o bloco é gravado
+            self._write_q.put((
+                rack_id,
+                time.time(),
+                state.get('temperature'),
+                state.get('humidity'),
+                state.get('door_status'),
+                state.get('ventilation_status'),
+                state.get('buzzer_status'),
+                state.get('latitude'),
+                state.get('longitude'),
+            ))
         except Exception as e:
-            print(f"[DB/Error] ❌ Error saving rack state: {e}")
+            logger.error("[DB/Error] ❌ Error saving rack state: %s", e)
 
     def on_rack_selected(self, current, previous):
         """Handle rack selection from list widget"""
@@ -1858,76 +2813,66 @@ class MainWindow(QMainWindow):
                 # Get or create Rack object and set as current
                 self.currentRack = self.getOrCreateRack(rack_id)
 
-                print(f"[UI/Selection] 🖱️ Selected rack {rack_id}")
+                logger.info("[UI/Selection] 🖱️ Selected rack %s", rack_id)
 
                 # Clear gauges and chart series so the new rack starts fresh
                 self.reset_dashboard_metrics()
 
-                # Load last state from database
-                row = self.execute_db(
-                    """
-                    SELECT temperature, humidity, door_status, ventilation_status, buzzer_status, latitude, longitude
-                    FROM rack_data 
-                    WHERE id=? 
-                    ORDER BY timestamp DESC 
-                    LIMIT 1
-                    """,
-                    (rack_id,),
-                    fetchone=True
-                )
+                # Load last state from database; values already received live take precedence,
+                # since the current minute is still buffered in the writer thread.
+                # O banco só é gravado a partir de rack_states: após a primeira
+                # carga não há nada nele que o cache ainda não tenha
+                if rack_id in self._db_restored_racks:
+                    row = None
+                else:
+                    row = self.load_last_telemetry(rack_id)
+                    self._db_restored_racks.add(rack_id)
 
                 if row:
                     temp, hum, door, vent, buzz, lat, lon = row
                     # Update cache with DB data
                     state = self.ensure_rack_state(rack_id)
-                    if temp is not None:
+                    if temp is not None and state.get('temperature') is None:
                         state['temperature'] = temp
-                        state['temperature_history'].append(temp)
-                    if hum is not None:
+                        self.append_history_sample(state, 'temperature_history', temp, time.time())
+                    if hum is not None and state.get('humidity') is None:
                         state['humidity'] = hum
-                        state['humidity_history'].append(hum)
-                    if door is not None:
+                        self.append_history_sample(state, 'humidity_history', hum, time.time())
+                    if door is not None and state.get('door_status') is None:
                         state['door_status'] = door
-                    if vent is not None:
+                    if vent is not None and state.get('ventilation_status') is None:
                         state['ventilation_status'] = vent
-                    if buzz is not None:
+                    if buzz is not None and state.get('buzzer_status') is None:
                         state['buzzer_status'] = buzz
-                    if lat is not None:
-                        state['latitude'] = lat
-                    if lon is not None:
-                        state['longitude'] = lon
+                    if state.get('latitude') is None or state.get('longitude') is None:
+                        self.set_rack_location(
+                            state,
+                            lat if state.get('latitude') is None else state['latitude'],
+                            lon if state.get('longitude') is None else state['longitude']
+                        )
                     
                     # Sync Rack object with state
+                    state['revision'] += 1
                     self.syncRackFromState(self.currentRack, state)
 
                 # Update UI
                 self.update_ui_from_state(rack_id)
 
             except Exception as e:
-                print(f"[DB/Error] ❌ Error loading rack data: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[DB/Error] ❌ Error loading rack data: %s", e)
 
     def reset_dashboard_metrics(self):
         """Clear gauge readings and chart series before showing another rack."""
         try:
-            # Reset map hash cache to force update on new rack selection
-            self._last_map_hash = None
-            
+            # Widgets voltam ao estado neutro: o próximo update redesenha tudo
+            self._last_rendered.clear()
+            self._chart_cache.clear()
+
             # Reset door status label to neutral state
             if hasattr(self, 'door_status_label'):
-                self.door_status_label.setText("🚪 Status: --")
-                self.door_status_label.setStyleSheet(
-                    """
-                    QLabel {
-                        color: white;
-                        font-size: 16px;
-                        padding: 10px 20px;
-                        background-color: #7f8c8d;
-                        border-radius: 5px;
-                    }
-                    """
-                )
+                text, qss = DOOR_UNKNOWN_STYLE
+                self.door_status_label.setText(text)
+                self.door_status_label.setStyleSheet(qss)
 
             # Reset temperature gauge and chart
             if hasattr(self, 'temp_gauge') and self.temp_gauge is not None:
@@ -1956,60 +2901,282 @@ class MainWindow(QMainWindow):
                 self.hum_axis_y.setRange(0, 100)
 
         except Exception as e:
-            print(f"[UI/Error] ❌ Error resetting dashboard metrics: {e}")
+            logger.error("[UI/Error] ❌ Error resetting dashboard metrics: %s", e)
 
-    def execute_db(self, query, params=None, *, fetchone=False, fetchall=False, commit=False):
-        """Thread-safe helper to execute database statements"""
-        with self.db_lock:
-            cursor = self.conn.cursor()
+    DB_CACHED_STATEMENTS = 512
+
+    RACKS_UPSERT = """
+        INSERT INTO racks(id, latitude, longitude) VALUES (?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            latitude = COALESCE(excluded.latitude, latitude),
+            longitude = COALESCE(excluded.longitude, longitude)
+    """
+
+    RACK_MINUTE_INSERT = "INSERT OR REPLACE INTO rack_minute(id, ts, payload) VALUES (?, ?, ?)"
+
+    # Leituras do último estado: texto fixo, reaproveitado pelo cache de statements
+    LAST_MINUTE_SELECT = """
+        SELECT m.payload, r.latitude, r.longitude
+        FROM rack_minute m LEFT JOIN racks r ON r.id = m.id
+        WHERE m.id=?
+        ORDER BY m.ts DESC
+        LIMIT 1
+    """
+    LAST_ROW_SELECT = """
+        SELECT temperature, humidity, door_status, ventilation_status, buzzer_status, latitude, longitude
+        FROM rack_data
+        WHERE id=?
+        ORDER BY timestamp DESC
+        LIMIT 1
+    """
+
+    # Registro empacotado de uma amostra: ``sec`` é o deslocamento em segundos
+    # desde ``rack_minute.ts``; leituras ausentes são NaN (floats) ou 255 (estados)
+    TELEMETRY_DTYPE = np.dtype([
+        ('sec', 'u1'),
+        ('temperature', 'f4'),
+        ('humidity', 'f4'),
+        ('door', 'u1'),
+        ('vent', 'u1'),
+        ('buzzer', 'u1'),
+    ])
+    TELEMETRY_MISSING_STATUS = 255
+
+    @staticmethod
+    def configure_db_connection(conn):
+        """Apply WAL journaling and relaxed fsync PRAGMAs to a SQLite connection"""
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _writer_loop(self):
+        """
+        Drain queued telemetry rows into SQLite in batches.
+
+        Cada lote reúne até ``db_batch_size`` linhas ou o que chegar em
+        ``db_batch_interval`` segundos após a primeira. As amostras são
+        acumuladas em blocos por rack e minuto, gravados como um único BLOB
+        quando o minuto termina. ``None`` na fila grava os blocos pendentes e
+        encerra a thread.
+        """
+        conn = self._open_db(autocommit=True)
+        blocks = {}
+        try:
+            stopping = False
+            while not stopping:
+                rows, stopping = self._collect_write_batch()
+                try:
+                    self._write_telemetry_batch(conn, blocks, rows, flushAll=stopping)
+                except sqlite3.Error as e:
+                    logger.error("[DB/Error] ❌ Error writing %d rack rows: %s", len(rows), e)
+        finally:
+            conn.close()
+            self._local.conn = None
+
+    def _collect_write_batch(self):
+        """Return ``(rows, stopping)`` with the next batch from the write queue."""
+        rows = []
+        try:
+            # Timeout curto para fechar blocos de minuto mesmo sem novas mensagens
+            row = self._write_q.get(timeout=1.0)
+        except queue.Empty:
+            return rows, False
+        if row is None:
+            return rows, True
+        rows.append(row)
+        deadline = time.monotonic() + self.db_batch_interval
+        while len(rows) < self.db_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                cursor.execute(query, params or ())
-                result = None
-                if fetchone:
-                    result = cursor.fetchone()
-                elif fetchall:
-                    result = cursor.fetchall()
-                if commit:
-                    self.conn.commit()
-                return result
-            finally:
-                cursor.close()
+                row = self._write_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if row is None:
+                return rows, True
+            rows.append(row)
+        return rows, False
+
+    def _write_telemetry_batch(self, conn, blocks, rows, flushAll=False):
+        """Fold ``rows`` into per-minute blocks and persist the finished ones."""
+        finished = []
+        locations = {}
+        missing = self.TELEMETRY_MISSING_STATUS
+        for rackId, epoch, temp, hum, door, vent, buzz, lat, lon in rows:
+            minute = int(epoch // 60)
+            block = blocks.get(rackId)
+            if block is None or block[0] != minute:
+                if block is not None:
+                    finished.append((rackId, block))
+                block = (minute, int(epoch), [])
+                blocks[rackId] = block
+            block[2].append((
+                int(epoch) - block[1],
+                np.nan if temp is None else temp,
+                np.nan if hum is None else hum,
+                missing if door is None else door,
+                missing if vent is None else vent,
+                missing if buzz is None else buzz,
+            ))
+            if lat is not None or lon is not None:
+                locations[rackId] = (lat, lon)
+            else:
+                locations.setdefault(rackId, (None, None))
+
+        currentMinute = int(time.time() // 60)
+        for rackId, block in list(blocks.items()):
+            if flushAll or block[0] < currentMinute:
+                finished.append((rackId, block))
+                del blocks[rackId]
+
+        if not locations and not finished:
+            return
+        # Conexão em autocommit: a transação do lote é aberta e fechada explicitamente
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                self.RACKS_UPSERT,
+                [(rackId, lat, lon) for rackId, (lat, lon) in locations.items()]
+            )
+            conn.executemany(
+                self.RACK_MINUTE_INSERT,
+                [(rackId, block[1], self.pack_telemetry(block[2])) for rackId, block in finished]
+            )
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @classmethod
+    def pack_telemetry(cls, records):
+        """Pack ``(sec, temperature, humidity, door, vent, buzzer)`` tuples into a BLOB."""
+        return np.array(records, dtype=cls.TELEMETRY_DTYPE).tobytes()
+
+    @classmethod
+    def unpack_telemetry(cls, payload):
+        """View a ``rack_minute`` BLOB as a structured array (no copy)."""
+        return np.frombuffer(payload, dtype=cls.TELEMETRY_DTYPE)
+
+    def load_last_telemetry(self, rack_id):
+        """
+        Return the latest stored ``(temperature, humidity, door, vent, buzzer, lat, lon)``.
+
+        Lê o último bloco de ``rack_minute``; bancos gravados antes do formato
+        compactado caem na tabela ``rack_data``.
+        """
+        row = self.execute_db(self.LAST_MINUTE_SELECT, (rack_id,), fetchone=True)
+        if row:
+            payload, lat, lon = row
+            last = self.unpack_telemetry(payload)[-1]
+            missing = self.TELEMETRY_MISSING_STATUS
+            temp = float(last['temperature'])
+            hum = float(last['humidity'])
+            door, vent, buzz = (int(last[field]) for field in ('door', 'vent', 'buzzer'))
+            return (
+                None if np.isnan(temp) else temp,
+                None if np.isnan(hum) else hum,
+                None if door == missing else door,
+                None if vent == missing else vent,
+                None if buzz == missing else buzz,
+                lat,
+                lon,
+            )
+        return self.execute_db(self.LAST_ROW_SELECT, (rack_id,), fetchone=True)
+
+    def _conn(self):
+        """Return the calling thread's SQLite connection, opening a read-only one on first use"""
+        return getattr(self._local, 'conn', None) or self._open_db(readOnly=True)
+
+    def _open_db(self, readOnly=False, autocommit=False):
+        """
+        Open a WAL-configured connection bound to the calling thread.
+
+        Só a thread ``db-writer`` abre a conexão de escrita; as demais (GUI)
+        usam ``mode=ro`` e nunca disputam o lock de escrita com ela. Com
+        ``autocommit`` o módulo sqlite3 não abre transações implícitas: o writer
+        delimita cada lote com BEGIN/COMMIT.
+        """
+        # Statements are always constant SQL with ``?`` placeholders, so the
+        # per-connection statement cache skips re-parsing on every call
+        if readOnly:
+            target = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+        else:
+            target = self.db_path
+        conn = self.configure_db_connection(
+            sqlite3.connect(
+                target,
+                uri=readOnly,
+                cached_statements=self.DB_CACHED_STATEMENTS,
+                isolation_level=None if autocommit else ""
+            )
+        )
+        self._local.conn = conn
+        return conn
+
+    def execute_db(self, query, params=None, *, fetchone=False, fetchall=False, commit=False):
+        """Execute a database statement on the calling thread's (read-only, off the writer) connection"""
+        conn = self._conn()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params or ())
+            result = None
+            if fetchone:
+                result = cursor.fetchone()
+            elif fetchall:
+                result = cursor.fetchall()
+            if commit:
+                conn.commit()
+            return result
+        finally:
+            cursor.close()
     
     def closeEvent(self, event):
         """Handle application close event - cleanup resources"""
-        print("[App/Shutdown] 🛑 Shutting down application...")
+        logger.info("[App/Shutdown] 🛑 Shutting down application...")
         try:
-            # Stop AI analysis timer
-            if hasattr(self, 'aiAnalysisTimer'):
-                self.aiAnalysisTimer.stop()
+            # Stop master timer (sampling, command timeouts and AI analysis)
+            if hasattr(self, 'history_timer'):
+                self.history_timer.stop()
             
             # Stop Tool Calling Service
             if hasattr(self, 'toolCallingService') and self.toolCallingService:
                 self.toolCallingService.stop()
-                print("[ToolCalling/Stop] 🤖 Tool Calling Service stopped")
+                logger.info("[ToolCalling/Stop] 🤖 Tool Calling Service stopped")
             
             # Stop Forecast Service
             if hasattr(self, 'forecastService') and self.forecastService:
                 self.forecastService.stop()
-                print("[Forecast/Stop] 📊 Forecast Service stopped")
+                logger.info("[Forecast/Stop] 📊 Forecast Service stopped")
             
-            # Stop all blinking timers
-            for rackId, timer in list(self.blinkingRacks.items()):
-                timer.stop()
+            # Stop the shared blinking timer
+            self._blinkTimer.stop()
             self.blinkingRacks.clear()
             
             # Stop MQTT client
             if hasattr(self, 'client'):
                 self.client.loop_stop()
                 self.client.disconnect()
-                print("[MQTT/Disconnect] 🔌 MQTT client disconnected")
+                logger.info("[MQTT/Disconnect] 🔌 MQTT client disconnected")
             
-            # Close database connection
-            if hasattr(self, 'conn'):
-                self.conn.close()
-                print("[DB/Close] 💾 Database connection closed")
+            # Flush pending telemetry rows before closing the database
+            if hasattr(self, '_persist_timer'):
+                self._persist_timer.stop()
+                self._flush_dirty_racks()
+            if hasattr(self, '_writer_thread'):
+                self._write_q.put(None)
+                self._writer_thread.join(timeout=5)
+                logger.info("[DB/Flush] 💾 Pending telemetry written")
+
+            # Close the GUI thread's database connection
+            conn = getattr(self._local, 'conn', None) if hasattr(self, '_local') else None
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+                logger.info("[DB/Close] 💾 Database connection closed")
         except Exception as e:
-            print(f"[App/Error] ❌ Error during cleanup: {e}")
+            logger.error("[App/Error] ❌ Error during cleanup: %s", e)
         finally:
             event.accept()
 
@@ -2037,16 +3204,14 @@ class MainWindow(QMainWindow):
             # Log do status do modelo
             modelInfo = self.forecastService.get_model_info()
             if modelInfo.get('using_granite'):
-                print(f"[Forecast/Init] ✅ ForecastService usando IBM Granite TTM-R2")
+                logger.info("[Forecast/Init] ✅ ForecastService usando IBM Granite TTM-R2")
             else:
-                print(f"[Forecast/Init] 📊 ForecastService usando SARIMA (fallback)")
+                logger.info("[Forecast/Init] 📊 ForecastService usando SARIMA (fallback)")
             
-            print(f"[Forecast/Init] 🎚️ MAE Threshold: {modelInfo.get('mae_threshold', 'N/A')}")
+            logger.info("[Forecast/Init] 🎚️ MAE Threshold: %s", modelInfo.get('mae_threshold', 'N/A'))
             
         except Exception as e:
-            print(f"[Forecast/Error] ❌ Erro ao inicializar ForecastService: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("[Forecast/Error] ❌ Erro ao inicializar ForecastService: %s", e, exc_info=True)
             self.forecastService = None
 
     def initializeToolCallingService(self):
@@ -2066,7 +3231,7 @@ class MainWindow(QMainWindow):
                 serverUrl = f"https://{serverUrl}"
             
             if not apiKey:
-                print("[ToolCalling/Warning] ⚠️ GENAI_API_KEY não configurada - AI control desabilitado")
+                logger.warning("[ToolCalling/Warning] ⚠️ GENAI_API_KEY não configurada - AI control desabilitado")
                 self.toolCallingService = None
                 return
             
@@ -2087,20 +3252,18 @@ class MainWindow(QMainWindow):
             # Configura o callback para atualizar a barra de status
             self.toolCallingService.setStatusCallback(self.onStatusCallback)
             
-            print(f"[ToolCalling/Init] ✅ ToolCallingService inicializado com modelo {model}")
-            print(f"[ToolCalling/Init] 🎚️ Thresholds carregados do .env")
+            logger.info("[ToolCalling/Init] ✅ ToolCallingService inicializado com modelo %s", model)
+            logger.info("[ToolCalling/Init] 🎚️ Thresholds carregados do .env")
             
         except Exception as e:
-            print(f"[ToolCalling/Error] ❌ Erro ao inicializar ToolCallingService: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("[ToolCalling/Error] ❌ Erro ao inicializar ToolCallingService: %s", e, exc_info=True)
             self.toolCallingService = None
 
     def runAiAnalysis(self):
         """
         Executa a análise AI periódica para determinar ações de controle.
         
-        Este método é chamado pelo timer aiAnalysisTimer.
+        Este método é chamado pelo timer mestre a cada ``aiAnalysisTicks`` ticks.
         """
         if not self.toolCallingService:
             return
@@ -2110,12 +3273,12 @@ class MainWindow(QMainWindow):
             executedActions = self.toolCallingService.analyzeAndExecute(self.racks)
             
             if executedActions:
-                print(f"[AI/Analysis] 🤖 {len(executedActions)} ação(ões) executada(s)")
+                logger.info("[AI/Analysis] 🤖 %d ação(ões) executada(s)", len(executedActions))
                 for action in executedActions:
-                    print(f"  └─ {action.function} em {action.rackId}: {action.reason}")
+                    logger.info("  └─ %s em %s: %s", action.function, action.rackId, action.reason)
                     
         except Exception as e:
-            print(f"[AI/Error] ❌ Erro na análise AI: {e}")
+            logger.error("[AI/Error] ❌ Erro na análise AI: %s", e)
 
     def onRackActionCallback(self, rackId: str, action: str):
         """
@@ -2128,7 +3291,7 @@ class MainWindow(QMainWindow):
             rackId: ID do rack onde a ação está sendo executada
             action: Nome da ação sendo executada
         """
-        print(f"[UI/Action] ⚡ Ação AI: {action} em Rack {rackId}")
+        logger.info("[UI/Action] ⚡ Ação AI: %s em Rack %s", action, rackId)
         
         # Emite signal para atualização thread-safe da UI
         self.action_executed.emit(rackId, action)
@@ -2158,12 +3321,7 @@ class MainWindow(QMainWindow):
             action: Nome da ação executada
         """
         # Ações de alerta usam fundo vermelho
-        alertActions = {
-            'activateCriticalTemperatureAlert',
-            'activateDoorOpenAlert',
-            'activateBreakInAlert'
-        }
-        isAlert = action in alertActions
+        isAlert = action in ALERT_ACTIONS
         self.blinkRackItem(rackId, isAlert=isAlert)
 
     def handleStatusUpdate(self, rackId: str, action: str, reason: str):
@@ -2177,39 +3335,15 @@ class MainWindow(QMainWindow):
             action: Nome da ação executada
             reason: Motivo da ação
         """
-        # Mapeamento de nomes de ação para texto legível
-        actionNames = {
-            'turnOnVentilation': '💨 Ligar Ventilação',
-            'turnOffVentilation': '💨 Desligar Ventilação',
-            'activateCriticalTemperatureAlert': '🔥 Alerta Temperatura Crítica',
-            'deactivateCriticalTemperatureAlert': '✅ Desativar Alerta Temp.',
-            'activateDoorOpenAlert': '🚪 Alerta Porta Aberta',
-            'activateBreakInAlert': '🚨 Alerta Arrombamento',
-            'silenceBuzzer': '🔕 Silenciar Buzzer',
-            'openDoor': '🚪 Abrir Porta',
-            'closeDoor': '🚪 Fechar Porta'
-        }
-        
-        actionText = actionNames.get(action, action)
+        actionText = ACTION_NAMES.get(action, action)
         
         # Atualiza status icon
         self.status_icon.setText("▶️")
-        self.status_icon.setStyleSheet("""
-            QLabel {
-                color: #27ae60;
-                font-size: 16px;
-            }
-        """)
+        self.status_icon.setStyleSheet(STATUS_ICON_ACTIVE_QSS)
         
         # Atualiza mensagem de status
         self.status_message.setText(f"Rack {rackId}: {actionText}")
-        self.status_message.setStyleSheet("""
-            QLabel {
-                color: #27ae60;
-                font-size: 13px;
-                font-weight: bold;
-            }
-        """)
+        self.status_message.setStyleSheet(STATUS_MESSAGE_ACTIVE_QSS)
         
         # Atualiza última ação
         self.last_action_label.setText(f"📝 {reason}")
@@ -2221,83 +3355,69 @@ class MainWindow(QMainWindow):
         """Reseta a barra de status para o estado normal."""
         if hasattr(self, 'status_icon'):
             self.status_icon.setText("⏸️")
-            self.status_icon.setStyleSheet("""
-                QLabel {
-                    color: #95a5a6;
-                    font-size: 16px;
-                }
-            """)
+            self.status_icon.setStyleSheet(STATUS_ICON_IDLE_QSS)
         
         if hasattr(self, 'status_message'):
             self.status_message.setText("Monitorando...")
-            self.status_message.setStyleSheet("""
-                QLabel {
-                    color: #ecf0f1;
-                    font-size: 13px;
-                }
-            """)
+            self.status_message.setStyleSheet(STATUS_MESSAGE_IDLE_QSS)
 
-    def blinkRackItem(self, rackId: str, duration: int = 2000, interval: int = 200, isAlert: bool = False):
+    def blinkRackItem(self, rackId: str, duration: int = 2000, isAlert: bool = False):
         """
         Faz um item de rack piscar no painel esquerdo.
         
+        O rack entra no dicionário ``blinkingRacks``, percorrido pelo timer
+        compartilhado ``_blinkTimer`` (200 ms); o timer só roda enquanto há
+        racks piscando.
+        
         Args:
             rackId: ID do rack para piscar
             duration: Duração total do efeito de piscar em ms (default: 2000)
-            interval: Intervalo entre piscadas em ms (default: 200)
             isAlert: Se True, usa fundo vermelho para indicar alerta (default: False)
         """
         try:
             # Encontra o item na lista
-            itemText = f"Rack {rackId}"
-            items = self.list_widget.findItems(itemText, Qt.MatchExactly)
+            item = self._rack_list_items.get(rackId)
             
-            if not items:
-                print(f"[UI/Blink] ⚠️ Rack não encontrado na lista: {rackId}")
+            if item is None:
+                logger.warning("[UI/Blink] ⚠️ Rack não encontrado na lista: %s", rackId)
                 return
             
-            item = items[0]
-            
-            # Se já está piscando, para o timer anterior
-            if rackId in self.blinkingRacks:
-                self.blinkingRacks[rackId].stop()
-            
             # Cores para piscar - vermelho para alertas, laranja para outras ações
-            normalBg = "#34495e"
-            highlightBg = "#e74c3c" if isAlert else "#f39c12"  # Vermelho para alerta, laranja para destaque
-            blinkState = {"on": False, "count": 0}
-            maxBlinks = duration // interval
+            highlightBg = BLINK_ALERT_BG if isAlert else BLINK_ACTION_BG
+            maxBlinks = duration // self._blinkTimer.interval()
             
-            def toggleBlink():
-                blinkState["count"] += 1
-                
-                if blinkState["count"] >= maxBlinks:
-                    # Finaliza a piscagem
-                    self.stopBlinkingRackItem(rackId)
-                    return
-                
-                blinkState["on"] = not blinkState["on"]
-                
-                if blinkState["on"]:
-                    item.setBackground(QColor(highlightBg))
-                    item.setForeground(QColor("#2c3e50"))  # Texto escuro
-                else:
-                    item.setBackground(QColor(normalBg))
-                    item.setForeground(QColor("white"))
-            
-            # Cria e inicia o timer
-            blinkTimer = QTimer(self)
-            blinkTimer.setInterval(interval)
-            blinkTimer.timeout.connect(toggleBlink)
-            blinkTimer.start()
-            
-            self.blinkingRacks[rackId] = blinkTimer
+            # Se já está piscando, recomeça a contagem com a nova cor
+            blink = [item, highlightBg, 0, maxBlinks]
+            self.blinkingRacks[rackId] = blink
+            if not self._blinkTimer.isActive():
+                self._blinkTimer.start()
             
             # Inicia com o primeiro toggle
-            toggleBlink()
+            self._stepBlink(rackId, blink)
             
         except Exception as e:
-            print(f"[UI/Blink] ❌ Erro ao piscar rack: {e}")
+            logger.error("[UI/Blink] ❌ Erro ao piscar rack: %s", e)
+
+    def _tickBlinks(self):
+        """Avança um passo da piscagem de todos os racks ativos."""
+        for rackId, blink in list(self.blinkingRacks.items()):
+            self._stepBlink(rackId, blink)
+
+    def _stepBlink(self, rackId: str, blink: list):
+        """Alterna as cores de um item; contagens ímpares usam o destaque."""
+        blink[2] += 1
+        if blink[2] >= blink[3]:
+            # Finaliza a piscagem
+            self.stopBlinkingRackItem(rackId)
+            return
+        
+        item = blink[0]
+        if blink[2] % 2:
+            item.setBackground(blink[1])
+            item.setForeground(BLINK_HIGHLIGHT_FG)  # Texto escuro
+        else:
+            item.setBackground(BLINK_NORMAL_BG)
+            item.setForeground(BLINK_NORMAL_FG)
 
     def stopBlinkingRackItem(self, rackId: str):
         """
@@ -2307,21 +3427,19 @@ class MainWindow(QMainWindow):
             rackId: ID do rack para parar de piscar
         """
         try:
-            if rackId in self.blinkingRacks:
-                self.blinkingRacks[rackId].stop()
-                del self.blinkingRacks[rackId]
+            self.blinkingRacks.pop(rackId, None)
+            if not self.blinkingRacks:
+                self._blinkTimer.stop()
             
             # Restaura a cor normal do item
-            itemText = f"Rack {rackId}"
-            items = self.list_widget.findItems(itemText, Qt.MatchExactly)
+            item = self._rack_list_items.get(rackId)
             
-            if items:
-                item = items[0]
-                item.setBackground(QColor("#34495e"))
-                item.setForeground(QColor("white"))
+            if item is not None:
+                item.setBackground(BLINK_NORMAL_BG)
+                item.setForeground(BLINK_NORMAL_FG)
                 
         except Exception as e:
-            print(f"[UI/Blink] ❌ Erro ao parar piscagem: {e}")
+            logger.error("[UI/Blink] ❌ Erro ao parar piscagem: %s", e)
 
     def checkExpiredCommands(self):
         """
@@ -2337,25 +3455,46 @@ class MainWindow(QMainWindow):
         expired = self.rackControlService.getExpiredCommands()
         
         for cmd in expired:
-            print(f"[UI/Timeout] ⏱️ Comando expirado: {cmd.commandType}={cmd.value} para rack {cmd.rackId}")
+            logger.warning("[UI/Timeout] ⏱️ Comando expirado: %s=%s para rack %s", cmd.commandType, cmd.value, cmd.rackId)
             
             # Notifica o usuário sobre o timeout
             timeoutSeconds = self.rackControlService.commandTimeout
-            print(f"[UI/Timeout] ⚠️ Firmware não confirmou em {timeoutSeconds}s - comando pode não ter sido executado")
+            logger.warning("[UI/Timeout] ⚠️ Firmware não confirmou em %ss - comando pode não ter sido executado", timeoutSeconds)
+
+def setup_logging():
+    """
+    Route log records through a queue to a background listener thread.
+
+    As threads da GUI e do MQTT só enfileiram o registro; a escrita no
+    console fica com o ``QueueListener``. Retorna o listener para ser parado
+    no encerramento (o que esvazia a fila).
+    """
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    return listener
+
 
 if __name__ == "__main__":
+    log_listener = setup_logging()
     try:
-        print("[App/Start] 🚀 Starting Rack Inteligente Dashboard...")
+        logger.info("[App/Start] 🚀 Starting Rack Inteligente Dashboard...")
         app = QApplication(sys.argv)
         window = MainWindow()
         window.show()
-        print("[App/Ready] ✅ Dashboard is ready!")
+        logger.info("[App/Ready] ✅ Dashboard is ready!")
         sys.exit(app.exec_())
     except KeyboardInterrupt:
-        print("\n[App/Interrupt] ⚠️  Application interrupted by user")
+        logger.warning("[App/Interrupt] ⚠️  Application interrupted by user")
         sys.exit(0)
     except Exception as e:
-        print(f"[App/Fatal] ❌ Fatal error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.critical("[App/Fatal] ❌ Fatal error: %s", e, exc_info=True)
         sys.exit(1)
+    finally:
+        # Grava o que ainda estiver na fila de logs antes de sair
+        log_listener.stop()
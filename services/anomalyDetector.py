@@ -3,37 +3,270 @@ Anomaly Detector Service
 Detecta anomalias em series temporais usando analise estatistica
 """
 
+import bisect
 import logging
-import statistics
+import math
+import warnings
+from collections import deque, namedtuple
+from itertools import islice
+from operator import itemgetter
+from datetime import datetime
 from typing import Dict, List, Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Severidade das anomalias por Z-score: SEVERITY_LEVELS[bisect_left(SEVERITY_THRESHOLDS, z)]
+# (z > 5σ critical, z > 4σ high, demais anomalias medium)
+SEVERITY_THRESHOLDS = (4.0, 5.0)
+SEVERITY_LEVELS = (('medium', '🟡'), ('high', '🟠'), ('critical', '🔴'))
+SEVERITY_NORMAL = ('normal', '🟢')
+
+# Resultado de detect(); quem precisar de dict usa info._asdict()
+AnomalyInfo = namedtuple('AnomalyInfo', (
+    'value', 'mean', 'stdev', 'zscore', 'threshold', 'deviation',
+    'window_size', 'is_anomaly', 'severity', 'severity_emoji'
+))
+# Instancias compartilhadas dos caminhos sem anomalia: nada e alocado por chamada,
+# e os campos numericos ficam None (estatisticas da janela nao sao expostas)
+NORMAL_INFO = AnomalyInfo(None, None, None, None, None, None, None, False, *SEVERITY_NORMAL)
+INSUFFICIENT_DATA_INFO = AnomalyInfo(None, None, None, None, None, None, None, False, 'insufficient_data', '⚪')
+
+# A cada quantas atualizacoes incrementais a janela e reancorada com soma exata
+# (math.fsum), descartando o erro de arredondamento acumulado pelas remocoes
+WELFORD_REANCHOR_INTERVAL = 1_000_000
+
+# Extrai 'value' dos pontos em C (map + itemgetter) ao montar arrays da janela
+_point_value = itemgetter('value')
+
+# Tentar importar numba para compilar o kernel de deteccao em lote
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+    logger.info("✅ [AnomalyDetector] numba disponível para deteccao em lote")
+except ImportError:
+    def njit(*args, **kwargs):
+        """Substituto sem compilação: retorna a função original."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def detect_batch_kernel(
+    values: np.ndarray,
+    epochs: np.ndarray,
+    window_size: int,
+    window_seconds: float,
+    threshold: float
+):
+    """
+    Avalia cada values[i] contra a janela dos pontos anteriores (Welford com ejecao).
+    
+    A janela de values[i] sao os ultimos window_size pontos de values[:i] e, se
+    window_seconds > 0, apenas os que distam no maximo window_seconds do ponto i-1.
+    
+    Returns:
+        tuple: (is_anomaly, zscores, means, stdevs) como arrays NumPy
+    """
+    total = values.shape[0]
+    is_anomaly = np.zeros(total, dtype=np.bool_)
+    zscores = np.zeros(total)
+    means = np.zeros(total)
+    stdevs = np.zeros(total)
+    lo = 0
+    n = 0
+    mean = 0.0
+    M2 = 0.0
+    for i in range(1, total):
+        value = values[i - 1]
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        M2 += delta * (value - mean)
+        while n > window_size or (window_seconds > 0 and epochs[lo] < epochs[i - 1] - window_seconds):
+            old = values[lo]
+            lo += 1
+            n -= 1
+            if n == 0:
+                mean = 0.0
+                M2 = 0.0
+            else:
+                delta = old - mean
+                mean -= delta / n
+                M2 = max(0.0, M2 - delta * (old - mean))
+        if n < 2:
+            continue
+        stdev = np.sqrt(M2 / (n - 1))
+        means[i] = mean
+        stdevs[i] = stdev
+        if stdev > 0:
+            zscores[i] = abs(values[i] - mean) / stdev
+            is_anomaly[i] = zscores[i] > threshold
+    return is_anomaly, zscores, means, stdevs
+
 
 class AnomalyDetector:
     """Detector de anomalias para series temporais usando Z-score"""
     
+    __slots__ = (
+        'threshold_multiplier', 'window_size', 'rolling_window_seconds', 'history_cap',
+        'anomaly_history', '_total_anomalies', '_recent_flags', '_recent_sum',
+        '_ring', '_head', '_n', '_mean', '_M2', '_updates', '_consumed', '_last_point',
+        '_last_timestamp', '_last_epoch', '_values', '_epochs', '_size', '_columns_synced',
+        '_stats_cache'
+    )
+    
     def __init__(
         self,
         threshold_multiplier: float = 3.0,
         window_size: int = 50,
-        rolling_window_seconds: int | None = None
+        rolling_window_seconds: int | None = None,
+        history_cap: int = 10_000,
+        recent_window: int = 100
     ):
         self.threshold_multiplier = threshold_multiplier
         self.window_size = window_size
         self.rolling_window_seconds = rolling_window_seconds
-        self.anomaly_history = []
+        self.history_cap = history_cap
+        # Historico limitado: as anomalias mais antigas sao descartadas em O(1)
+        self.anomaly_history: deque = deque(maxlen=history_cap)
+        # Total desde o ultimo reset (o deque perde as entradas antigas)
+        self._total_anomalies = 0
+        # Flags 0/1 das ultimas recent_window deteccoes e sua soma corrente,
+        # para consultar a taxa recente em O(1)
+        self._recent_flags: deque = deque(maxlen=recent_window)
+        self._recent_sum = 0
+        
+        # Estado de Welford da janela por contagem: anel pre-alocado com os
+        # valores da janela (_head = proxima escrita), media e M2
+        self._ring = np.empty(window_size, dtype=np.float64)
+        self._head = 0
+        self._n = 0
+        self._mean = 0.0
+        self._M2 = 0.0
+        self._updates = 0
+        # Quantos pontos de data_history ja entraram na janela e o ultimo deles,
+        # para reconhecer um historico que so recebeu novos pontos no fim
+        self._consumed = 0
+        self._last_point = None
+        # Ultimo timestamp ISO convertido (lotes costumam repetir o mesmo instante)
+        self._last_timestamp = None
+        self._last_epoch = 0.0
+        # Colunas (valores/epochs) dos pontos recebidos via ingest(), em ordem
+        # cronologica; compactadas para os ultimos window_size ao encher
+        self._values = np.empty(2 * window_size, dtype=np.float64)
+        self._epochs = np.empty(2 * window_size, dtype=np.float64)
+        self._size = 0
+        # Se a janela de Welford reflete as colunas (True) ou um data_history
+        self._columns_synced = True
+        # Estatisticas da ultima janela avaliada: (historico, tamanho, ultimo ponto,
+        # media, desvio, 1/desvio, tamanho da janela); historico None = colunas
+        self._stats_cache = None
         
         logger.info(
-            f"⚠️  [AnomalyDetector] Initialized with threshold={threshold_multiplier}σ, "
-            f"window={window_size}"
+            "⚠️  [AnomalyDetector] Initialized with threshold=%sσ, window=%s",
+            threshold_multiplier, window_size
         )
     
-    def _calculate_statistics(self, values: List[float]) -> Tuple[float, float]:
-        """Calcula media e desvio padrao de uma lista de valores"""
-        if len(values) < 2:
+    def _calculate_statistics(self, values) -> Tuple[float, float]:
+        """Calcula media e desvio padrao amostral de uma sequencia de valores (NumPy)"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size < 2:
             return 0.0, 0.0
-        return statistics.mean(values), statistics.stdev(values)
+        return float(values.mean()), float(values.std(ddof=1))
+    
+    def _push_value(self, value: float):
+        """
+        Adiciona um valor a janela, ejetando o mais antigo se cheia.
+        
+        Usa a forma de Welford M2 += (x - media_antiga) * (x - media_nova), a
+        mais estavel das atualizacoes de uma passada (Welford 1962; analise de
+        Youngs & Cramer 1971 / Chan, Golub & LeVeque 1983). Como as remocoes da
+        janela deslizante acumulam erro, o estado e reancorado periodicamente.
+        """
+        head = self._head
+        if self._n >= self.window_size:
+            self._pop_value(float(self._ring[head]))
+        self._ring[head] = value
+        self._head = (head + 1) % self.window_size
+        self._n += 1
+        delta = value - self._mean
+        self._mean += delta / self._n
+        self._M2 += delta * (value - self._mean)
+        self._updates += 1
+        if self._updates >= WELFORD_REANCHOR_INTERVAL:
+            self._reanchor_window()
+    
+    def _reanchor_window(self):
+        """Recalcula media e M2 da janela com somas compensadas (math.fsum)"""
+        self._updates = 0
+        n = self._n
+        if n == 0:
+            return
+        values = self._ring[:n].tolist()
+        mean = math.fsum(values) / n
+        self._mean = mean
+        self._M2 = math.fsum((value - mean) ** 2 for value in values)
+    
+    def _pop_value(self, value: float):
+        """Remove da media e de M2 um valor que saiu da janela (Welford inverso)"""
+        self._n -= 1
+        if self._n == 0:
+            self._mean = 0.0
+            self._M2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._n
+        self._M2 = max(0.0, self._M2 - delta * (value - self._mean))
+    
+    def _rebuild_window(self, values: np.ndarray):
+        """Recarrega a janela com os ultimos window_size valores em uma unica passada NumPy"""
+        values = values[-self.window_size:]
+        n = values.size
+        self._ring[:n] = values
+        self._head = n % self.window_size
+        self._n = n
+        self._updates = 0
+        if n:
+            self._mean = float(values.mean())
+            self._M2 = float(np.square(values - self._mean).sum())
+        else:
+            self._mean = 0.0
+            self._M2 = 0.0
+    
+    def _sync_window(self, data_history: List[Dict]):
+        """
+        Atualiza a janela com os pontos novos de data_history.
+        
+        Se o historico e o mesmo da chamada anterior acrescido de pontos no fim,
+        so esses pontos entram (O(1) por amostra); caso contrario a janela e
+        reconstruida a partir dos ultimos window_size pontos.
+        """
+        consumed = self._consumed
+        if (
+            0 < consumed <= len(data_history)
+            and data_history[consumed - 1] is self._last_point
+            and len(data_history) - consumed < self.window_size
+        ):
+            for point in data_history[consumed:]:
+                self._push_value(point['value'])
+        else:
+            tail = data_history[-self.window_size:]
+            self._rebuild_window(
+                np.fromiter(map(_point_value, tail), dtype=np.float64, count=len(tail))
+            )
+        self._consumed = len(data_history)
+        self._last_point = data_history[-1]
+        self._columns_synced = False
+    
+    def _window_statistics(self) -> Tuple[float, float, int]:
+        """Retorna (media, desvio padrao amostral, tamanho) da janela incremental"""
+        if self._n < 2:
+            return 0.0, 0.0, self._n
+        return self._mean, math.sqrt(self._M2 / (self._n - 1)), self._n
     
     def _calculate_zscore(self, value: float, mean: float, stdev: float) -> float:
         """Calcula Z-score (numero de desvios padrao do valor em relacao a media)"""
@@ -41,109 +274,268 @@ class AnomalyDetector:
             return 0.0
         return abs(value - mean) / stdev
     
-    def _filter_by_time_window(self, data_history: List[Dict]) -> List[Dict]:
-        """Filtra dados pela janela de tempo configurada."""
-        if not self.rolling_window_seconds or not data_history:
-            return data_history
+    def _parse_timestamp(self, timestamp: str) -> float:
+        """Converte um timestamp ISO em epoch, reaproveitando o ultimo texto convertido"""
+        if timestamp == self._last_timestamp:
+            return self._last_epoch
+        epoch = datetime.fromisoformat(timestamp).timestamp()
+        self._last_timestamp = timestamp
+        self._last_epoch = epoch
+        return epoch
 
-        latest_timestamp = data_history[-1]['timestamp']
-        try:
-            from datetime import datetime
+    def _point_epoch(self, point: Dict) -> float:
+        """
+        Retorna o epoch do ponto, convertendo o timestamp ISO so na primeira vez.
+        
+        O valor fica memorizado no proprio ponto em '_epoch'; chamadores que ja
+        conhecem o epoch podem preencher essa chave ao criar o ponto.
+        """
+        epoch = point.get('_epoch')
+        if epoch is None:
+            epoch = self._parse_timestamp(point['timestamp'])
+            point['_epoch'] = epoch
+        return epoch
 
-            latest_dt = datetime.fromisoformat(latest_timestamp)
-            cutoff = latest_dt.timestamp() - self.rolling_window_seconds
+    def _time_window_start(self, data_history: List[Dict]) -> int:
+        """
+        Retorna o indice do primeiro ponto dentro da janela de tempo configurada.
+        
+        data_history e mantido em ordem cronologica (so recebe pontos no fim),
+        entao o corte e localizado por busca binaria: O(log N) pontos convertidos.
+        """
+        if not self.rolling_window_seconds or not data_history:
+            return 0
 
-            filtered = [
-                point for point in data_history
-                if datetime.fromisoformat(point['timestamp']).timestamp() >= cutoff
-            ]
-            return filtered if filtered else data_history[-self.window_size:]
+        fallback = max(0, len(data_history) - self.window_size)
+        try:
+            point_epoch = self._point_epoch
+            cutoff = point_epoch(data_history[-1]) - self.rolling_window_seconds
+            start = bisect.bisect_left(data_history, cutoff, key=point_epoch)
+            return start if start < len(data_history) else fallback
         except Exception as error:
             logger.error("❌ [AnomalyDetector] Failed to filter by time window", exc_info=error)
-            return data_history[-self.window_size:]
+            return fallback
 
-    def detect(self, current_value: float, data_history: List[Dict]) -> Tuple[bool, Dict]:
+    def _filter_by_time_window(self, data_history: List[Dict], window_cap: int | None = None) -> List[Dict]:
+        """Filtra dados pela janela de tempo configurada, limitando a window_cap pontos."""
+        start = self._time_window_start(data_history)
+        if window_cap is not None:
+            start = max(start, len(data_history) - window_cap)
+        return data_history[start:]
+
+    def ingest(self, value: float, epoch: float):
+        """
+        Registra um ponto nas colunas internas (alternativa a passar data_history)
+        
+        Os pontos devem chegar em ordem cronologica; detect() sem data_history
+        avalia o valor contra a janela formada pelos pontos ingeridos.
+        """
+        size = self._size
+        if size == self._values.shape[0]:
+            keep = self.window_size
+            self._values[:keep] = self._values[size - keep:size]
+            self._epochs[:keep] = self._epochs[size - keep:size]
+            size = keep
+        self._values[size] = value
+        self._epochs[size] = epoch
+        self._size = size + 1
+        self._stats_cache = None
+        # A janela incremental passa a acompanhar as colunas
+        if self._columns_synced:
+            self._push_value(value)
+        else:
+            self._sync_columns_window()
+        self._consumed = 0
+        self._last_point = None
+
+    def _sync_columns_window(self):
+        """Reconstroi a janela de Welford a partir dos ultimos window_size pontos das colunas"""
+        size = self._size
+        self._rebuild_window(self._values[max(0, size - self.window_size):size])
+        self._columns_synced = True
+
+    def _columnar_statistics(self) -> Tuple[float, float, int]:
+        """Retorna (media, desvio padrao, tamanho) da janela sobre as colunas ingeridas"""
+        if not self._columns_synced:
+            # A janela foi sincronizada por um data_history: volta para as colunas
+            self._sync_columns_window()
+        size = self._size
+        start = 0
+        if self.rolling_window_seconds:
+            epochs = self._epochs[:size]
+            start = int(np.searchsorted(epochs, epochs[-1] - self.rolling_window_seconds, side='left'))
+        if start > max(0, size - self.window_size):
+            window_values = self._values[start:size]
+            mean, stdev = self._calculate_statistics(window_values)
+            return mean, stdev, window_values.size
+        return self._window_statistics()
+
+    def _history_statistics(self, data_history: List[Dict]) -> Tuple[float, float, int]:
+        """Retorna (media, desvio padrao, tamanho) da janela sobre data_history"""
+        start = self._time_window_start(data_history)
+        if start > max(0, len(data_history) - self.window_size):
+            # A janela por tempo cortou pontos dentro da janela por contagem: recalcula
+            # (fatia unica, ja limitada a window_size pontos)
+            window_data = data_history[start:]
+            window_values = np.fromiter(
+                map(_point_value, window_data), dtype=np.float64, count=len(window_data)
+            )
+            mean, stdev = self._calculate_statistics(window_values)
+            return mean, stdev, len(window_values)
+        self._sync_window(data_history)
+        return self._window_statistics()
+
+    def _cached_statistics(self, data_history: List[Dict] | None) -> Tuple[float, float, float, int]:
+        """
+        Retorna (media, desvio, 1/desvio, tamanho) da janela, reaproveitando o
+        resultado quando o historico nao mudou desde a ultima chamada
+        (varias metricas avaliadas em sequencia sobre o mesmo snapshot).
+        """
+        cache = self._stats_cache
+        size = self._size if data_history is None else len(data_history)
+        last_point = None if data_history is None else data_history[-1]
+        if (
+            cache is not None
+            and cache[0] is data_history
+            and cache[1] == size
+            and cache[2] is last_point
+        ):
+            return cache[3], cache[4], cache[5], cache[6]
+
+        if data_history is None:
+            mean, stdev, window_len = self._columnar_statistics()
+        else:
+            mean, stdev, window_len = self._history_statistics(data_history)
+        inv_stdev = 1.0 / stdev if stdev else 0.0
+        self._stats_cache = (data_history, size, last_point, mean, stdev, inv_stdev, window_len)
+        return mean, stdev, inv_stdev, window_len
+
+    def detect(self, current_value: float, data_history: List[Dict] | None = None) -> Tuple[bool, AnomalyInfo]:
         """
         Detecta se o valor atual e uma anomalia
         
         Args:
             current_value: Valor atual a avaliar
-            data_history: Historico completo de dados
+            data_history: Historico completo de dados; se None, usa os pontos
+                registrados via ingest()
             
         Returns:
-            tuple: (is_anomaly: bool, info: dict)
-        """
-        if len(data_history) < 2:
-            return False, {
-                'reason': 'insufficient_data',
-                'data_points': len(data_history),
-                'required': 2
-            }
-        
-        window_data = self._filter_by_time_window(data_history)[-self.window_size:]
-        window_values = [point['value'] for point in window_data]
-        
-        mean, stdev = self._calculate_statistics(window_values)
-        zscore = self._calculate_zscore(current_value, mean, stdev)
-        is_anomaly = zscore > self.threshold_multiplier
-        
-        info = {
-            'value': current_value,
-            'mean': mean,
-            'stdev': stdev,
-            'zscore': zscore,
-            'threshold': self.threshold_multiplier,
-            'deviation': zscore,
-            'window_size': len(window_values),
-            'is_anomaly': is_anomaly
-        }
+            tuple: (is_anomaly: bool, info: AnomalyInfo); sem anomalia, info e a
+            instancia compartilhada NORMAL_INFO (ou INSUFFICIENT_DATA_INFO com
+            menos de 2 pontos)
+        """
+        data_points = self._size if data_history is None else len(data_history)
+        if data_points < 2:
+            return False, INSUFFICIENT_DATA_INFO
         
-        if is_anomaly:
-            if zscore > 5.0:
-                info['severity'] = 'critical'
-                info['severity_emoji'] = '🔴'
-            elif zscore > 4.0:
-                info['severity'] = 'high'
-                info['severity_emoji'] = '🟠'
-            else:
-                info['severity'] = 'medium'
-                info['severity_emoji'] = '🟡'
-            
-            self.anomaly_history.append({
-                'timestamp': data_history[-1]['timestamp'] if data_history else None,
-                'info': info
-            })
+        mean, stdev, inv_stdev, window_len = self._cached_statistics(data_history)
+        # Limiar comparado ao quadrado: |v - media| / desvio > k  <=>  (v - media)^2 > (k * desvio)^2
+        deviation = current_value - mean
+        threshold_spread = self.threshold_multiplier * stdev
+        is_anomaly = stdev > 0 and deviation * deviation > threshold_spread * threshold_spread
+        zscore = abs(deviation) * inv_stdev
+        
+        recent_flags = self._recent_flags
+        if len(recent_flags) == recent_flags.maxlen:
+            self._recent_sum -= recent_flags[0]
+        recent_flags.append(1 if is_anomaly else 0)
+        self._recent_sum += recent_flags[-1]
+        
+        if not is_anomaly:
+            return False, NORMAL_INFO
+        
+        severity, severity_emoji = SEVERITY_LEVELS[bisect.bisect_left(SEVERITY_THRESHOLDS, zscore)]
+        info = AnomalyInfo(
+            current_value, mean, stdev, zscore, self.threshold_multiplier, zscore,
+            window_len, True, severity, severity_emoji
+        )
+        self.anomaly_history.append({
+            'timestamp': (
+                data_history[-1]['timestamp'] if data_history
+                else datetime.fromtimestamp(self._epochs[self._size - 1]).isoformat()
+            ),
+            'info': info
+        })
+        self._total_anomalies += 1
+        
+        logger.warning(
+            "%s [AnomalyDetector] Anomaly detected! Value=%.2f, Mean=%.2f, Deviation=%.2fσ, Severity=%s",
+            severity_emoji, current_value, mean, zscore, severity
+        )
+        
+        return True, info
+    
+    def _batch_epochs(self, timestamps) -> np.ndarray:
+        """
+        Converte epochs, datetime64 ou timestamps ISO em epochs float64.
+        
+        Textos ISO sao convertidos em lote pelo parser C do NumPy (datetime64[ns]);
+        o kernel so compara diferencas entre pontos, entao a referencia UTC do
+        NumPy e equivalente ao horario local de fromisoformat(). Textos que o
+        NumPy nao aceita (ex.: com fuso) caem na conversao ponto a ponto.
+        """
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype.kind not in 'UOM':
+            return np.ascontiguousarray(timestamps, dtype=np.float64)
+        try:
+            # Fuso explicito so gera aviso no NumPy: tratado como erro para usar o fallback
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                return timestamps.astype('datetime64[ns]').astype(np.int64) / 1e9
+        except (ValueError, TypeError, Warning):
+            parse = self._parse_timestamp
+            return np.fromiter((parse(str(ts)) for ts in timestamps), dtype=np.float64, count=timestamps.size)
+
+    def detect_batch(self, values, epochs=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Detecta anomalias em uma serie inteira (backfill/historico) de uma vez
+        
+        Cada valor e avaliado contra os pontos anteriores, como se detect() fosse
+        chamado ponto a ponto; nao altera o historico de anomalias do detector.
+        
+        Args:
+            values: Valores da serie em ordem cronologica
+            epochs: Epoch de cada valor (necessario com rolling_window_seconds);
+                aceita tambem timestamps ISO ou datetime64, convertidos em lote
             
-            logger.warning(
-                f"{info['severity_emoji']} [AnomalyDetector] Anomaly detected! "
-                f"Value={current_value:.2f}, Mean={mean:.2f}, "
-                f"Deviation={zscore:.2f}σ, Severity={info['severity']}"
-            )
+        Returns:
+            tuple: (is_anomaly, zscores, means, stdevs) como arrays NumPy
+        """
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if epochs is None or not self.rolling_window_seconds:
+            epochs = np.zeros(values.shape[0], dtype=np.float64)
+            window_seconds = 0.0
         else:
-            info['severity'] = 'normal'
-            info['severity_emoji'] = '🟢'
-        
-        return is_anomaly, info
+            epochs = self._batch_epochs(epochs)
+            window_seconds = float(self.rolling_window_seconds)
+        return detect_batch_kernel(
+            values, epochs, self.window_size, window_seconds, float(self.threshold_multiplier)
+        )
     
-    def get_anomaly_rate(self, recent_count: int = 100) -> float:
-        """Calcula taxa de anomalias recentes"""
-        if not self.anomaly_history:
+    def get_anomaly_rate(self, recent_count: int | None = None) -> float:
+        """Calcula taxa de anomalias nas ultimas recent_count deteccoes (padrao: recent_window)"""
+        recent_flags = self._recent_flags
+        if not recent_flags or (recent_count is not None and recent_count <= 0):
             return 0.0
-        recent_anomalies = self.anomaly_history[-recent_count:]
-        return len(recent_anomalies) / recent_count if recent_count > 0 else 0.0
+        if recent_count is None or recent_count >= len(recent_flags):
+            return self._recent_sum / len(recent_flags)
+        return sum(islice(reversed(recent_flags), recent_count)) / recent_count
     
     def get_statistics(self) -> Dict:
         """Retorna estatisticas do detector"""
         return {
-            'total_anomalies': len(self.anomaly_history),
+            'total_anomalies': self._total_anomalies,
             'threshold_multiplier': self.threshold_multiplier,
             'window_size': self.window_size,
-            'recent_anomaly_rate': self.get_anomaly_rate(100)
+            'recent_anomaly_rate': self.get_anomaly_rate()
         }
     
     def reset(self):
         """Reseta historico de anomalias"""
         self.anomaly_history.clear()
+        self._total_anomalies = 0
+        self._recent_flags.clear()
+        self._recent_sum = 0
         logger.info("🔄 [AnomalyDetector] Reset anomaly history")
     
     def adjust_sensitivity(self, new_threshold: float):
@@ -151,6 +543,6 @@ class AnomalyDetector:
         old_threshold = self.threshold_multiplier
         self.threshold_multiplier = new_threshold
         logger.info(
-            f"🎚️  [AnomalyDetector] Sensitivity adjusted: "
-            f"{old_threshold}σ → {new_threshold}σ"
+            "🎚️  [AnomalyDetector] Sensitivity adjusted: %sσ → %sσ",
+            old_threshold, new_threshold
         )
@@ -24,6 +24,7 @@ import warnings
 import signal
 import sys
 import threading
+import time
 
 # Importar serviço de fallback SARIMA
 from services.sarimaFallbackService import SarimaFallbackService, SarimaConfig, ForecastResult
@@ -91,9 +92,18 @@ class ForecastService:
         # Intervalo de agregação de dados (em segundos)
         self.sampleInterval = int(os.getenv("FORECAST_SAMPLE_INTERVAL", "3600"))
         
+        # Precisão da inferência Granite: float32 (padrão), bfloat16, float16 ou
+        # auto (float16 em CUDA, bfloat16 em CPU) via autocast
+        self.graniteDtype = os.getenv("FORECAST_GRANITE_DTYPE", "float32").lower()
+        # FORECAST_COMPILE=1 ativa torch.compile (reduce-overhead) do Granite em CUDA;
+        # desligado por padrão: o warm-up leva vários segundos na inicialização
+        self.graniteCompile = os.getenv("FORECAST_COMPILE", "0") == "1"
+        
         if GRANITE_AVAILABLE:
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            logger.info(f"🔮 [ForecastService] Using IBM Granite TTM-R2 on {self.device}")
+            if self.graniteDtype == "auto":
+                self.graniteDtype = "float16" if self.device == "cuda" else "bfloat16"
+            logger.info(f"🔮 [ForecastService] Using IBM Granite TTM-R2 on {self.device} ({self.graniteDtype})")
         else:
             self.device = "cpu"
             logger.info(f"🔮 [ForecastService] Granite não disponível - SARIMA será o fallback")
@@ -101,6 +111,9 @@ class ForecastService:
         self._model_loaded = False
         self._running = True
         
+        # Gerador próprio para o ruído da previsão simples (sem o RNG global legado)
+        self._rng = np.random.default_rng()
+        
         # Configuração do sistema de fallback SARIMA com sazonalidade múltipla
         maeThreshold = float(os.getenv("FORECAST_MAE_THRESHOLD", "5.0"))
         seasonalPeriodDaily = int(os.getenv("FORECAST_SEASONAL_PERIOD_DAILY", "24"))
@@ -201,6 +214,36 @@ class ForecastService:
         if not data_history:
             return []
         
+        try:
+            # Caminho rápido: parse em lote para datetime64 e média por hora via bincount
+            with warnings.catch_warnings():
+                # Fuso explícito só gera aviso no NumPy: tratado como erro para usar o pandas
+                warnings.simplefilter('error')
+                timestamps = np.array([point['timestamp'] for point in data_history], dtype='datetime64[us]')
+            values = np.fromiter(
+                (point['value'] for point in data_history), dtype=np.float64, count=len(data_history)
+            )
+            valid = ~np.isnat(timestamps) & np.isfinite(values)
+            hours = timestamps[valid].astype('datetime64[h]').astype(np.int64)
+            if hours.size == 0:
+                return []
+            firstHour = hours.min()
+            hourIndex = hours - firstHour
+            sums = np.bincount(hourIndex, weights=values[valid])
+            counts = np.bincount(hourIndex)
+            filled = np.flatnonzero(counts)
+            hourStarts = (filled + firstHour).astype('datetime64[h]').astype('datetime64[s]').tolist()
+            hourlyData = [
+                {'timestamp': ts.isoformat(), 'value': float(mean)}
+                for ts, mean in zip(hourStarts, (sums[filled] / counts[filled]).tolist())
+            ]
+            
+            logger.debug(f"📊 [ForecastService] Agregado {len(data_history)} amostras -> {len(hourlyData)} horas")
+            return hourlyData
+        except (ValueError, TypeError, KeyError, Warning):
+            # Timestamps com fuso ou valores não numéricos: segue pelo pandas
+            pass
+        
         try:
             # Converter para DataFrame
             df = pd.DataFrame(data_history)
@@ -227,6 +270,58 @@ class ForecastService:
             logger.warning(f"⚠️ [ForecastService] Erro na agregação horária: {e}")
             return data_history
     
+    def aggregateHourlyArray(
+        self,
+        values: np.ndarray,
+        startTimestamp: float,
+        periodSeconds: float = 1.0
+    ) -> List[Dict]:
+        """
+        Agrega amostras uniformemente espaçadas em médias por intervalo (hora).
+
+        Equivalente a ``aggregateHourlyData``, mas recebe um array contíguo e o
+        epoch da primeira amostra: os timestamps são derivados aritmeticamente e
+        a média de cada balde é obtida com ``np.add.reduceat``, sem criar um
+        dict/string por amostra. Os baldes são horas UTC (epoch // intervalo),
+        monotônicos mesmo na troca de horário de verão, e os rótulos são ISO em
+        UTC sem sufixo de fuso, como no acumulador horário do dashboard.
+
+        Args:
+            values: Valores em ordem cronológica
+            startTimestamp: Epoch (s) da primeira amostra
+            periodSeconds: Intervalo entre amostras em segundos
+
+        Returns:
+            List[Dict]: Dados agregados [{timestamp, value}, ...]
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return []
+
+        timestamps = startTimestamp + np.arange(values.size) * periodSeconds
+        buckets = np.floor(timestamps / self.sampleInterval).astype(np.int64)
+
+        valid = np.isfinite(values)
+        if not valid.all():
+            values = values[valid]
+            buckets = buckets[valid]
+            if values.size == 0:
+                return []
+
+        # Baldes são monotônicos: cada fronteira é uma mudança de índice
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        counts = np.diff(np.append(starts, values.size))
+        means = np.add.reduceat(values, starts) / counts
+
+        bucketStarts = (buckets[starts] * self.sampleInterval).astype('datetime64[s]').tolist()
+        hourlyData = [
+            {'timestamp': bucketStart.isoformat(), 'value': float(mean)}
+            for bucketStart, mean in zip(bucketStarts, means.tolist())
+        ]
+
+        logger.debug(f"📊 [ForecastService] Agregado {values.size} amostras -> {len(hourlyData)} horas")
+        return hourlyData
+
     def addAnnualSeasonalComponent(self, predictions: List[float], baseTimestamp: datetime) -> List[float]:
         """
         Adiciona componente de sazonalidade anual às previsões.
@@ -246,25 +341,24 @@ class ForecastService:
             return predictions
         
         try:
-            adjustedPredictions = []
+            values = np.asarray(predictions, dtype=np.float64)
             
-            for i, value in enumerate(predictions):
-                # Calcular timestamp futuro
-                futureTs = baseTimestamp + timedelta(hours=i+1)
-                dayOfYear = futureTs.timetuple().tm_yday
-                
-                # Calcular fator sazonal usando função senoidal
-                # Pico no verão (dia 355 = 21 Dez no hemisfério sul)
-                # Vale no inverno (dia 172 = 21 Jun)
-                # Amplitude de ~3°C para temperatura
-                seasonalPhase = 2 * np.pi * (dayOfYear - 355) / 365
-                seasonalFactor = np.cos(seasonalPhase)  # -1 a +1
-                
-                # Amplitude do ajuste sazonal (pode ser configurável)
-                seasonalAmplitude = 3.0  # °C
-                adjustment = seasonalFactor * seasonalAmplitude
-                
-                adjustedPredictions.append(value + adjustment)
+            # Timestamps futuros (base + 1h, 2h, ...) e dia do ano de cada um,
+            # calculados de uma vez em datetime64 (horário de parede, como timedelta)
+            baseHour = np.datetime64(baseTimestamp.replace(tzinfo=None), 'h')
+            futureTs = baseHour + np.arange(1, values.size + 1)
+            dayOfYear = (futureTs.astype('datetime64[D]') - futureTs.astype('datetime64[Y]')).astype(np.int64) + 1
+            
+            # Calcular fator sazonal usando função senoidal
+            # Pico no verão (dia 355 = 21 Dez no hemisfério sul)
+            # Vale no inverno (dia 172 = 21 Jun)
+            # Amplitude de ~3°C para temperatura
+            seasonalPhase = 2 * np.pi * (dayOfYear - 355) / 365
+            seasonalFactor = np.cos(seasonalPhase)  # -1 a +1
+            
+            # Amplitude do ajuste sazonal (pode ser configurável)
+            seasonalAmplitude = 3.0  # °C
+            adjustedPredictions = (values + seasonalFactor * seasonalAmplitude).tolist()
             
             logger.debug(f"📅 [ForecastService] Ajuste sazonal anual aplicado a {len(predictions)} previsões")
             return adjustedPredictions
@@ -285,8 +379,11 @@ class ForecastService:
         """
         recent_data = data_history[-self.context_length:]
         
-        timestamps = [pd.to_datetime(point['timestamp']) for point in recent_data]
-        values = [point['value'] for point in recent_data]
+        # Conversão vetorizada: um único parse para todos os timestamps
+        timestamps = pd.to_datetime([point['timestamp'] for point in recent_data])
+        values = np.fromiter(
+            (point['value'] for point in recent_data), dtype=np.float64, count=len(recent_data)
+        )
         
         series = pd.Series(values, index=timestamps)
         series = series.sort_index()
@@ -327,6 +424,22 @@ class ForecastService:
         Returns:
             np.ndarray: Array 1D com valores float64.
         """
+        # Caminho rápido: saída numérica retangular (caso usual do pipeline)
+        try:
+            flat = np.asarray(raw_predictions, dtype=np.float64).ravel()
+        except (TypeError, ValueError):
+            flat = None
+
+        if flat is not None:
+            sanitized = flat[np.isfinite(flat)]
+            if limit is not None:
+                sanitized = sanitized[:limit]
+            logger.debug(
+                f"🧹 [ForecastService/Granite] Sanitized predictions: {len(sanitized)} points"
+            )
+            return sanitized
+
+        # Estruturas irregulares: percorre com pilha explícita
         sanitized_values: List[float] = []
         stack: List[Any] = [raw_predictions]
 
@@ -394,28 +507,22 @@ class ForecastService:
         else:
             seasonal = np.zeros(period)
         
-        # Gerar previsoes
-        predictions = []
-        last_value = series.values[-1]
+        # Gerar previsoes para todos os passos de uma vez (media e desvio calculados uma unica vez)
+        steps_idx = np.arange(steps)
         
-        for i in range(steps):
-            # Tendencia
-            trend_value = trend(len(recent_values) + i)
-            
-            # Sazonalidade
-            seasonal_idx = i % len(seasonal)
-            seasonal_value = seasonal[seasonal_idx] - np.mean(recent_values)
-            
-            # Combinacao com suavizacao
-            pred = trend_value + seasonal_value * 0.3
-            
-            # Adicionar pequeno ruido para variacao
-            noise = np.random.normal(0, np.std(recent_values) * 0.1)
-            pred += noise
-            
-            predictions.append(pred)
+        # Tendencia
+        trend_values = trend(len(recent_values) + steps_idx)
+        
+        # Sazonalidade
+        seasonal_values = np.asarray(seasonal, dtype=np.float64)[steps_idx % len(seasonal)] - np.mean(recent_values)
+        
+        # Combinacao com suavizacao
+        predictions = trend_values + seasonal_values * 0.3
         
-        return np.array(predictions)
+        # Adicionar pequeno ruido para variacao (todas as amostras em uma chamada)
+        predictions = predictions + self._rng.normal(0.0, np.std(recent_values) * 0.1, size=steps)
+        
+        return np.asarray(predictions, dtype=np.float64)
     
     def _load_granite_model(self):
         """Carrega o modelo IBM Granite TTM-R2 (lazy loading)"""
@@ -430,24 +537,77 @@ class ForecastService:
                 num_input_channels=1,
             )
             
-            self.granite_pipeline = TimeSeriesForecastingPipeline(
-                self.granite_model,
-                timestamp_column="timestamp",
-                id_columns=[],
-                target_columns=["value"],
-                explode_forecasts=False,
-                freq="S",
-                device=self.device,
-            )
+            # Grafo especializado para o formato fixo de entrada (CUDA graphs em reduce-overhead)
+            compiled = self.graniteCompile and self.device == "cuda" and hasattr(torch, "compile")
+            if compiled:
+                self.granite_model = torch.compile(self.granite_model, mode="reduce-overhead", dynamic=False)
+            
+            self._build_granite_pipeline()
             
             self._model_loaded = True
             logger.info(f"✅ [ForecastService] Granite TTM-R2 loaded on {self.device}")
             
+            if compiled:
+                self._warmup_granite()
+            
         except Exception as e:
             logger.error(f"❌ [ForecastService] Error loading Granite: {str(e)}")
             self.use_granite = False
             logger.info("📊 [ForecastService] Falling back to Exponential Smoothing")
     
+    def _build_granite_pipeline(self):
+        """Cria o pipeline de previsão sobre o modelo Granite atual"""
+        self.granite_pipeline = TimeSeriesForecastingPipeline(
+            self.granite_model,
+            timestamp_column="timestamp",
+            id_columns=[],
+            target_columns=["value"],
+            explode_forecasts=False,
+            freq="S",
+            device=self.device,
+        )
+    
+    def _warmup_granite(self):
+        """
+        Executa uma previsão sintética com o formato esperado (context_length
+        pontos) para compilar o grafo no carregamento e não na primeira previsão
+        real. Se a compilação falhar, volta ao modelo não compilado.
+        """
+        warmupStart = time.time()
+        try:
+            warmupDf = pd.DataFrame({
+                'timestamp': pd.date_range(end=pd.Timestamp.now().floor('h'), periods=self.context_length, freq='h'),
+                'value': np.zeros(self.context_length, dtype=np.float64)
+            })
+            self._run_granite_pipeline(warmupDf)
+            logger.info(f"🔥 [ForecastService/Granite] torch.compile warm-up concluído em {time.time() - warmupStart:.3f}s")
+        except Exception as e:
+            logger.warning(f"⚠️  [ForecastService/Granite] torch.compile falhou ({e}) - usando modelo sem compilação")
+            self.granite_model = getattr(self.granite_model, "_orig_mod", self.granite_model)
+            self._build_granite_pipeline()
+    
+    def _run_granite_pipeline(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Executa o pipeline Granite sem rastreamento de gradientes (inference_mode)
+        e, se configurado, com autocast em precisão reduzida (BF16/FP16).
+        
+        Os pesos permanecem em float32: o autocast converte só as operações
+        elegíveis. Se a precisão reduzida falhar, volta a float32 em definitivo.
+        """
+        autocastDtype = {'bfloat16': torch.bfloat16, 'float16': torch.float16}.get(self.graniteDtype)
+        with torch.inference_mode():
+            if autocastDtype is None:
+                return self.granite_pipeline(df)
+            try:
+                with torch.autocast(device_type=self.device, dtype=autocastDtype):
+                    return self.granite_pipeline(df)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️  [ForecastService/Granite] Inferência em {self.graniteDtype} falhou ({e}) - usando float32"
+                )
+                self.graniteDtype = "float32"
+                return self.granite_pipeline(df)
+    
     def _granite_forecast(self, data_history: List[Dict], steps: int) -> Optional[np.ndarray]:
         """
         Realiza previsao usando IBM Granite TTM-R2
@@ -473,13 +633,12 @@ class ForecastService:
             recent_data = data_history[-self.context_length:]
             logger.info(f"📊 [ForecastService/Granite] Preparing data: {len(recent_data)} points")
             
-            df = pd.DataFrame([
-                {
-                    'timestamp': pd.to_datetime(point['timestamp']),
-                    'value': point['value']
-                }
-                for point in recent_data
-            ])
+            df = pd.DataFrame({
+                'timestamp': pd.to_datetime([point['timestamp'] for point in recent_data]),
+                'value': np.fromiter(
+                    (point['value'] for point in recent_data), dtype=np.float64, count=len(recent_data)
+                )
+            })
             df = df.sort_values('timestamp').reset_index(drop=True)
             
             logger.info(f"📋 [ForecastService/Granite] DataFrame shape: {df.shape}")
@@ -490,7 +649,7 @@ class ForecastService:
             logger.info(f"🔮 [ForecastService/Granite] Starting prediction with {steps} steps...")
             prediction_start = time.time()
             
-            forecast_df = self.granite_pipeline(df)
+            forecast_df = self._run_granite_pipeline(df)
             
             prediction_time = time.time() - prediction_start
             logger.info(f"⏱️  [ForecastService/Granite] Prediction completed in {prediction_time:.3f}s")
@@ -640,12 +799,15 @@ class ForecastService:
                 return tempPredictions
             
             # Calcular média e tendência da umidade
-            humidityValues = [h['value'] for h in humidityHourly[-24:]]  # Últimas 24h
-            avgHumidity = np.mean(humidityValues)
+            recentHourly = humidityHourly[-24:]  # Últimas 24h
+            humidityValues = np.fromiter(
+                (h['value'] for h in recentHourly), dtype=np.float64, count=len(recentHourly)
+            )
+            avgHumidity = humidityValues.mean()
             
             # Calcular tendência da umidade (slope)
-            if len(humidityValues) >= 2:
-                humiditySlope = (humidityValues[-1] - humidityValues[0]) / len(humidityValues)
+            if humidityValues.size >= 2:
+                humiditySlope = (humidityValues[-1] - humidityValues[0]) / humidityValues.size
             else:
                 humiditySlope = 0.0
             
@@ -655,31 +817,25 @@ class ForecastService:
             # Coeficiente de impacto: cada 10% acima de 50% adiciona ~0.5°C
             humidityImpactCoeff = 0.05  # °C por % de umidade
             
-            correctedPredictions = []
-            for i, tempValue in enumerate(tempPredictions):
-                # Projetar umidade futura baseada na tendência
-                projectedHumidity = avgHumidity + (humiditySlope * (i + 1))
-                projectedHumidity = max(0, min(100, projectedHumidity))  # Clamp 0-100
-                
-                # Calcular desvio da umidade ideal
-                humidityDeviation = projectedHumidity - referenceHumidity
-                
-                # Aplicar correção
-                # - Umidade alta (>50%): aumenta temperatura prevista
-                # - Umidade baixa (<50%): reduz temperatura prevista
-                correction = humidityDeviation * humidityImpactCoeff
-                
-                correctedTemp = tempValue + correction
-                correctedPredictions.append(correctedTemp)
+            tempValues = np.asarray(tempPredictions, dtype=np.float64)
+            
+            # Projetar umidade futura baseada na tendência (passos 1..N), limitada a 0-100
+            steps = np.arange(1, tempValues.size + 1, dtype=np.float64)
+            projectedHumidity = np.clip(avgHumidity + humiditySlope * steps, 0, 100)
+            
+            # Aplicar correção sobre o desvio da umidade ideal
+            # - Umidade alta (>50%): aumenta temperatura prevista
+            # - Umidade baixa (<50%): reduz temperatura prevista
+            correctedValues = tempValues + (projectedHumidity - referenceHumidity) * humidityImpactCoeff
             
             logger.debug(
                 f"💧 [ForecastService] Correção de umidade aplicada: "
                 f"avg={avgHumidity:.1f}%, trend={humiditySlope:+.2f}%/h, "
-                f"correction range=[{min(correctedPredictions)-min(tempPredictions):+.2f}, "
-                f"{max(correctedPredictions)-max(tempPredictions):+.2f}]°C"
+                f"correction range=[{correctedValues.min()-tempValues.min():+.2f}, "
+                f"{correctedValues.max()-tempValues.max():+.2f}]°C"
             )
             
-            return correctedPredictions
+            return correctedValues.tolist()
             
         except Exception as e:
             logger.warning(f"⚠️ [ForecastService] Erro na correção de umidade: {e}")
@@ -713,8 +869,7 @@ class ForecastService:
         Returns:
             dict: Previsoes com timestamps e valores, ou None se erro
         """
-        import time as time_module
-        predict_start = time_module.time()
+        predict_start = time.time()
         
         if len(data_history) < 10:
             logger.warning(
@@ -722,14 +877,41 @@ class ForecastService:
             )
             return None
         
-        try:
-            # Agregar dados por hora se configurado
-            if aggregateData and len(data_history) > self.sampleInterval:
-                workingData = self.aggregateHourlyData(data_history)
-                logger.info(f"📊 [ForecastService] Dados agregados: {len(data_history)} -> {len(workingData)} pontos horários")
-            else:
-                workingData = data_history
+        # Agregar dados por hora se configurado
+        aggregated = aggregateData and len(data_history) > self.sampleInterval
+        if aggregated:
+            workingData = self.aggregateHourlyData(data_history)
+            logger.info(f"📊 [ForecastService] Dados agregados: {len(data_history)} -> {len(workingData)} pontos horários")
+        else:
+            workingData = data_history
+        
+        return self._predictWorkingData(workingData, len(data_history), aggregated, exogenousData, predict_start)
+    
+    def _predictWorkingData(
+        self,
+        workingData: List[Dict],
+        originalDataPoints: int,
+        aggregated: bool,
+        exogenousData: Optional[List[Dict]],
+        predict_start: float
+    ) -> Optional[Dict]:
+        """
+        Executa a cadeia de modelos sobre dados já preparados (agregados ou não).
+        
+        Compartilhado por ``predict`` e ``predictArray``; a validação de tamanho
+        mínimo é feita pelos chamadores sobre os dados originais.
+        
+        Args:
+            workingData: Dados de entrada dos modelos [{timestamp, value}, ...]
+            originalDataPoints: Quantidade de amostras antes da agregação
+            aggregated: Se os dados foram agregados por hora
+            exogenousData: Dados exógenos (ex: umidade) para correção de previsão
+            predict_start: Instante de início da previsão (para métricas de tempo)
             
+        Returns:
+            dict: Previsoes com timestamps e valores, ou None se erro
+        """
+        try:
             # Horizonte de previsão: 24 horas
             steps = min(self.forecast_horizon, 24)
             logger.info(f"🎯 [ForecastService] Starting prediction: {len(workingData)} data points, {steps}h forecast horizon")
@@ -740,9 +922,9 @@ class ForecastService:
             
             if self.use_granite and len(workingData) >= self.context_length:
                 logger.info("🔮 [ForecastService] Usando IBM Granite TTM-R2 para previsao")
-                granite_start = time_module.time()
+                granite_start = time.time()
                 forecast_values = self._granite_forecast(workingData, steps)
-                granite_time = time_module.time() - granite_start
+                granite_time = time.time() - granite_start
                 
                 if forecast_values is not None:
                     model_used = "IBM Granite TTM-R2"
@@ -757,24 +939,24 @@ class ForecastService:
                 else:
                     logger.info("📊 [ForecastService] Usando SARIMA (Granite nao disponivel)")
                 
-                fallback_start = time_module.time()
+                fallback_start = time.time()
                 forecast_values = self._sarima_fallback_forecast(workingData, steps)
                 
                 if forecast_values is not None:
                     model_used = self.sarimaFallback.getModelInfo()['modelType']
                     self.useFallback = True
-                    fallback_time = time_module.time() - fallback_start
+                    fallback_time = time.time() - fallback_start
                     logger.info(f"✅ [ForecastService] SARIMA fallback completed in {fallback_time:.3f}s")
             
             # Fallback secundário: Exponential Smoothing (se SARIMA também falhar)
             if forecast_values is None:
                 logger.warning("⚠️  [ForecastService] SARIMA falhou, usando Exponential Smoothing (fallback secundário)")
                 
-                fallback_start = time_module.time()
+                fallback_start = time.time()
                 series = self._prepare_series(workingData)
                 forecast_values = self._exponential_smoothing_forecast(series, steps)
                 model_used = "Exponential Smoothing (Holt-Winters)"
-                fallback_time = time_module.time() - fallback_start
+                fallback_time = time.time() - fallback_start
                 logger.info(f"✅ [ForecastService] Exponential Smoothing fallback completed in {fallback_time:.3f}s")
             
             # Aplicar ajuste de sazonalidade anual às previsões
@@ -798,14 +980,14 @@ class ForecastService:
                 logger.info(f"💧 [ForecastService] Correção de umidade aplicada às previsões")
             
             # Intervalo de previsão: 1 hora (dados agregados) ou original
-            if aggregateData and len(data_history) > self.sampleInterval:
+            if aggregated:
                 interval_hours = 1  # 1 hora entre previsões
             else:
                 # Calcular intervalo dos dados originais
                 if len(workingData) >= 2:
-                    t1 = pd.to_datetime(workingData[-1]['timestamp'])
+                    # O último timestamp já foi convertido acima
                     t2 = pd.to_datetime(workingData[-2]['timestamp'])
-                    interval_hours = (t1 - t2).total_seconds() / 3600
+                    interval_hours = (last_timestamp - t2).total_seconds() / 3600
                 else:
                     interval_hours = 1.0
             
@@ -832,27 +1014,90 @@ class ForecastService:
                 'forecast_timestamp': datetime.now().isoformat(),
                 'forecast_horizon_hours': steps,
                 'context_size': len(workingData),
-                'original_data_points': len(data_history),
-                'aggregated': aggregateData and len(data_history) > self.sampleInterval,
+                'original_data_points': originalDataPoints,
+                'aggregated': aggregated,
                 'annual_seasonality_applied': self.enableAnnualSeasonality,
                 'humidity_correction_applied': humidity_correction_applied,
                 'model': model_used,
                 'model_type': 'granite' if 'Granite' in model_used else 'statistical'
             }
             
-            total_predict_time = time_module.time() - predict_start
+            total_predict_time = time.time() - predict_start
             logger.info(f"✅ [ForecastService] Previsão 24h concluída: {len(predictions)} pontos horários usando {model_used} em {total_predict_time:.3f}s")
             logger.debug(f"📦 [ForecastService] Result size: {len(str(result))} bytes")
             
             return result
             
         except Exception as e:
-            total_predict_time = time_module.time() - predict_start
+            total_predict_time = time.time() - predict_start
             logger.error(f"❌ [ForecastService] Prediction error after {total_predict_time:.3f}s: {str(e)}")
             logger.error(f"❌ [ForecastService] Exception type: {type(e).__name__}")
             logger.error(f"❌ [ForecastService] Stack trace:", exc_info=True)
             return None
     
+    def predictArray(
+        self,
+        values: np.ndarray,
+        startTimestamp: float,
+        periodSeconds: float = 1.0,
+        exogenousValues: Optional[np.ndarray] = None,
+        aggregateData: bool = True
+    ) -> Optional[Dict]:
+        """
+        Realiza previsão a partir de um array de amostras uniformemente espaçadas.
+
+        Caminho rápido de ``predict``: em vez de uma lista de dicts com um
+        timestamp ISO por amostra, recebe o array de valores, o epoch da primeira
+        amostra e o período. A agregação horária é feita sobre o array e apenas
+        os pontos agregados (≤ context_length) são convertidos para o formato
+        aceito pelos modelos.
+
+        Args:
+            values: Valores em ordem cronológica
+            startTimestamp: Epoch (s) da primeira amostra
+            periodSeconds: Intervalo entre amostras em segundos
+            exogenousValues: Série exógena (ex: umidade) com o mesmo período,
+                alinhada pelo final com ``values``
+            aggregateData: Se True, agrega em médias horárias; use False quando
+                ``values`` já estiver agregado (ex: médias horárias da ingestão)
+
+        Returns:
+            dict: Mesmo formato de ``predict``, ou None se erro
+        """
+        predictStart = time.time()
+        values = np.asarray(values, dtype=np.float64)
+        if values.size < 10:
+            logger.warning(
+                f"⚠️  [ForecastService] Insufficient data: {values.size} < 10"
+            )
+            return None
+
+        aggregate = aggregateData and values.size > self.sampleInterval
+
+        def toDataHistory(array: np.ndarray, start: float) -> List[Dict]:
+            if aggregate:
+                return self.aggregateHourlyArray(array, start, periodSeconds)
+            # Rótulos em UTC (sem sufixo de fuso), como os baldes de aggregateHourlyArray
+            timestamps = (start + np.arange(array.size) * periodSeconds).astype('datetime64[s]').tolist()
+            return [
+                {'timestamp': timestamp.isoformat(), 'value': float(value)}
+                for timestamp, value in zip(timestamps, array.tolist())
+            ]
+
+        workingData = toDataHistory(values, startTimestamp)
+        if aggregate:
+            logger.info(f"📊 [ForecastService] Dados agregados: {values.size} -> {len(workingData)} pontos horários")
+
+        exogenousData = None
+        if exogenousValues is not None:
+            exogenousValues = np.asarray(exogenousValues, dtype=np.float64)
+            if exogenousValues.size:
+                lastTimestamp = startTimestamp + (values.size - 1) * periodSeconds
+                exogenousStart = lastTimestamp - (exogenousValues.size - 1) * periodSeconds
+                exogenousData = toDataHistory(exogenousValues, exogenousStart)
+
+        return self._predictWorkingData(workingData, int(values.size), aggregate, exogenousData, predictStart)
+    
     def is_model_loaded(self) -> bool:
         """Verifica se o modelo esta carregado"""
         return self._model_loaded
@@ -878,8 +1123,10 @@ class ForecastService:
         if n == 0:
             return 0.0
         
-        errors = [abs(predictions[i] - actuals[i]) for i in range(n)]
-        return sum(errors) / n
+        errors = np.abs(
+            np.asarray(predictions[:n], dtype=np.float64) - np.asarray(actuals[:n], dtype=np.float64)
+        )
+        return float(errors.mean())
     
     def updateMaeTracking(self, predicted: float, actual: float) -> float:
         """
@@ -966,6 +1213,7 @@ class ForecastService:
             'forecast_horizon': self.forecast_horizon,
             'context_length': self.context_length,
             'device': self.device,
+            'granite_dtype': self.graniteDtype,
             'loaded': self._model_loaded,
             'gpu_available': torch.cuda.is_available() if GRANITE_AVAILABLE else False,
             'fallback_active': self.useFallback,
@@ -13,6 +13,7 @@ O sistema utiliza confirmação de comandos via ACK:
 Autor: Dashboard Rack Inteligente - EmbarcaTech
 """
 
+import logging
 import os
 import time
 import threading
@@ -20,6 +21,8 @@ from dataclasses import dataclass, field
 from typing import Optional, Dict, Callable, Any
 from enum import IntEnum
 
+logger = logging.getLogger(__name__)
+
 
 class DoorStatus(IntEnum):
     """Status da porta do rack."""
@@ -173,7 +176,7 @@ class RackControlService:
             bool: True se publicado com sucesso, False caso contrário
         """
         if self.mqttClient is None:
-            print(f"[RackControlService/Error] ❌ MQTT client not initialized")
+            logger.error("[RackControlService/Error] ❌ MQTT client not initialized")
             return False
         
         topic = f"{self.baseTopic}/{rack.rackId}/command/{commandType}"
@@ -190,13 +193,13 @@ class RackControlService:
                         timestamp=time.time(),
                         callback=callback
                     )
-                print(f"[RackControlService/Command] 📤 Sent {commandType}={value} to rack {rack.rackId} (awaiting ACK)")
+                logger.info("[RackControlService/Command] 📤 Sent %s=%s to rack %s (awaiting ACK)", commandType, value, rack.rackId)
                 return True
             else:
-                print(f"[RackControlService/Error] ❌ Failed to publish: rc={result.rc}")
+                logger.error("[RackControlService/Error] ❌ Failed to publish: rc=%s", result.rc)
                 return False
         except Exception as e:
-            print(f"[RackControlService/Error] ❌ Exception publishing command: {e}")
+            logger.error("[RackControlService/Error] ❌ Exception publishing command: %s", e)
             return False
     
     def processAck(self, rackId: str, commandType: str, value: int) -> bool:
@@ -222,25 +225,25 @@ class RackControlService:
         
         if pendingCmd:
             success = (pendingCmd.value == value)
-            print(f"[RackControlService/ACK] ✅ Received ACK for {commandType}={value} from rack {rackId}")
+            logger.info("[RackControlService/ACK] ✅ Received ACK for %s=%s from rack %s", commandType, value, rackId)
             
             # Chama callback do comando se existir
             if pendingCmd.callback:
                 try:
                     pendingCmd.callback(success)
                 except Exception as e:
-                    print(f"[RackControlService/Error] ❌ Callback error: {e}")
+                    logger.error("[RackControlService/Error] ❌ Callback error: %s", e)
             
             # Notifica callback externo
             if self.onAckReceived:
                 try:
                     self.onAckReceived(rackId, commandType, value, success)
                 except Exception as e:
-                    print(f"[RackControlService/Error] ❌ External callback error: {e}")
+                    logger.error("[RackControlService/Error] ❌ External callback error: %s", e)
             
             return True
         else:
-            print(f"[RackControlService/ACK] ⚠️ Unexpected ACK for {commandType}={value} from rack {rackId} (no pending command)")
+            logger.warning("[RackControlService/ACK] ⚠️ Unexpected ACK for %s=%s from rack %s (no pending command)", commandType, value, rackId)
             return False
     
     def hasPendingCommand(self, rackId: str, commandType: str) -> bool:
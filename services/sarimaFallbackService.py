@@ -16,7 +16,7 @@ import logging
 import numpy as np
 import pandas as pd
 from typing import Any, Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass
 from collections import deque
 import warnings
@@ -38,6 +38,43 @@ try:
 except ImportError:
     logger.warning("⚠️ [SarimaFallbackService] statsmodels não disponível - usando implementação simplificada")
 
+# Tentar importar numba para compilar as recursões da implementação simplificada
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+    logger.info("✅ [SarimaFallbackService] numba disponível para kernels AR")
+except ImportError:
+    def njit(*args, **kwargs):
+        """Substituto sem compilação: retorna a função original."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def arForecastKernel(lastValues: np.ndarray, phi: np.ndarray, steps: int) -> np.ndarray:
+    """
+    Recursão AR de múltiplos passos: ŷ_t = Σ φ_i · y_{t-i}.
+
+    Args:
+        lastValues: Últimos ``len(phi)`` valores da série estacionária (cronológicos)
+        phi: Coeficientes AR
+        steps: Número de passos a prever
+
+    Returns:
+        np.ndarray: Previsões na série estacionária
+    """
+    p = phi.shape[0]
+    buffer = np.empty(p + steps)
+    buffer[:p] = lastValues
+    for t in range(steps):
+        acc = 0.0
+        for i in range(p):
+            acc += phi[i] * buffer[p + t - 1 - i]
+        buffer[p + t] = acc
+    return buffer[p:]
+
 
 @dataclass
 class SarimaConfig:
@@ -335,11 +372,7 @@ class SarimaFallbackService:
         for _ in range(D):
             if len(originalSeries) >= s:
                 baseValues = originalSeries[-s:]
-                newResult = []
-                for i, val in enumerate(result):
-                    idx = i % s
-                    newResult.append(val + baseValues[idx])
-                result = np.array(newResult)
+                result = result + baseValues[np.arange(len(result)) % s]
         
         return result
     
@@ -372,10 +405,8 @@ class SarimaFallbackService:
             acorr = acorr[n-1:] / acorr[n-1]  # Normaliza
             
             # Monta matriz de Toeplitz
-            R = np.zeros((p, p))
-            for i in range(p):
-                for j in range(p):
-                    R[i, j] = acorr[abs(i - j)]
+            lags = np.arange(p)
+            R = acorr[np.abs(lags[:, None] - lags[None, :])]
             
             r = acorr[1:p+1]
             
@@ -427,21 +458,16 @@ class SarimaFallbackService:
             arCoeffs = self._fitArCoefficients(diffSeries, cfg.p)
             
             # Gera previsões na série diferenciada
-            forecasts = []
-            buffer = list(diffSeries[-cfg.p:]) if cfg.p > 0 else []
-            
-            for _ in range(steps):
-                if cfg.p > 0 and len(arCoeffs) > 0:
-                    # Previsão AR
-                    pred = np.dot(arCoeffs, buffer[-cfg.p:][::-1])
-                else:
-                    # Sem AR, usa média
-                    pred = np.mean(diffSeries[-10:])
-                
-                forecasts.append(pred)
-                buffer.append(pred)
-            
-            forecasts = np.array(forecasts)
+            if cfg.p > 0 and len(arCoeffs) > 0:
+                # Previsão AR (kernel compilado com numba quando disponível)
+                forecasts = arForecastKernel(
+                    np.ascontiguousarray(diffSeries[-cfg.p:], dtype=np.float64),
+                    np.ascontiguousarray(arCoeffs, dtype=np.float64),
+                    steps
+                )
+            else:
+                # Sem AR, usa média
+                forecasts = np.full(steps, np.mean(diffSeries[-10:]))
             
             # Inverte diferenciação
             result = self._invertDifferencing(forecasts, series, cfg.d, cfg.s, cfg.D)
@@ -576,7 +602,7 @@ class SarimaFallbackService:
         try:
             # Extrai valores e timestamps
             values = np.array([point['value'] for point in dataHistory])
-            timestamps = [pd.to_datetime(point['timestamp']) for point in dataHistory]
+            timestamps = pd.to_datetime([point['timestamp'] for point in dataHistory])
             
             # Detecta sazonalidade se configurado
             if self.config.autoSelectParams:
@@ -601,10 +627,8 @@ class SarimaFallbackService:
             else:
                 interval = 1.0
             
-            futureTimestamps = []
-            for i in range(steps):
-                futureTs = lastTimestamp + timedelta(seconds=interval * (i + 1))
-                futureTimestamps.append(futureTs.isoformat())
+            futureIndex = lastTimestamp + pd.to_timedelta(interval * np.arange(1, steps + 1), unit='s')
+            futureTimestamps = [futureTs.isoformat() for futureTs in futureIndex]
             
             # Calcula confiança baseada na variância
             variance = np.var(values[-50:]) if len(values) >= 50 else np.var(values)
@@ -651,6 +675,7 @@ class SarimaFallbackService:
             'currentMae': self.currentMae,
             'fallbackActive': self.fallbackActive,
             'statsmodelsAvailable': STATSMODELS_AVAILABLE,
+            'numbaAvailable': NUMBA_AVAILABLE,
             'running': self._running
         }
     
@@ -0,0 +1,71 @@
+"""
+Testes do AnomalyDetector: caminho por colunas (ingest) intercalado com data_history
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from services.anomalyDetector import AnomalyDetector, AnomalyInfo, NORMAL_INFO
+
+
+def _history(values, epochs):
+    return [
+        {'value': float(value), 'timestamp': datetime.fromtimestamp(epoch).isoformat()}
+        for value, epoch in zip(values, epochs)
+    ]
+
+
+def test_columnar_window_ignores_interleaved_history_calls():
+    rng = np.random.default_rng(7)
+    columnValues = rng.normal(20.0, 1.0, 120)
+    historyValues = rng.normal(80.0, 5.0, 120)
+    epochs = 1_700_000_000.0 + np.arange(120)
+    history = _history(historyValues, epochs)
+
+    detector = AnomalyDetector(window_size=25)
+    for i in range(120):
+        detector.ingest(columnValues[i], epochs[i])
+        # Chamada pelo data_history entre ingestões nao pode contaminar as colunas
+        detector.detect(historyValues[i], history[:i + 1])
+        detector.detect(columnValues[i])
+        if i == 0:
+            continue
+        mean, stdev, _, windowLen = detector._cached_statistics(None)
+        window = columnValues[max(0, i + 1 - 25):i + 1]
+        assert windowLen == window.size
+        assert np.isclose(mean, window.mean())
+        assert np.isclose(stdev, window.std(ddof=1))
+
+
+def test_history_window_ignores_interleaved_ingest_calls():
+    rng = np.random.default_rng(11)
+    columnValues = rng.normal(20.0, 1.0, 80)
+    historyValues = rng.normal(80.0, 5.0, 80)
+    epochs = 1_700_000_000.0 + np.arange(80)
+    history = _history(historyValues, epochs)
+
+    detector = AnomalyDetector(window_size=25)
+    for i in range(1, 80):
+        detector.ingest(columnValues[i], epochs[i])
+        recent = history[:i + 1]
+        detector.detect(historyValues[i], recent)
+        mean, stdev, _, _ = detector._cached_statistics(recent)
+        window = historyValues[max(0, i + 1 - 25):i + 1]
+        assert np.isclose(mean, window.mean())
+        assert np.isclose(stdev, window.std(ddof=1))
+
+
+def test_detect_returns_shared_info_on_normal_path():
+    detector = AnomalyDetector(window_size=25)
+    for i, value in enumerate([20.0, 20.5, 19.5, 20.2, 19.8]):
+        detector.ingest(value, 1_700_000_000.0 + i)
+    isAnomaly, info = detector.detect(20.1)
+    assert not isAnomaly
+    assert info is NORMAL_INFO
+
+    isAnomaly, info = detector.detect(60.0)
+    assert isAnomaly
+    assert isinstance(info, AnomalyInfo)
+    assert info._asdict()['value'] == 60.0
+    assert detector.anomaly_history[-1]['info'] is info